@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from station.models import (
+    Operator,
     Ticket,
     Route,
     Station,
@@ -9,9 +10,16 @@ from station.models import (
     Train,
     TrainType,
     Order,
+    ImageJob,
+    SeatHold,
+    ArchivedOrder,
+    ArchivedTicket,
+    JourneySchedule,
+    CrewAssignment,
 )
 
 
+admin.site.register(Operator)
 admin.site.register(Ticket)
 admin.site.register(Route)
 admin.site.register(Station)
@@ -20,3 +28,9 @@ admin.site.register(Journey)
 admin.site.register(Train)
 admin.site.register(TrainType)
 admin.site.register(Order)
+admin.site.register(ImageJob)
+admin.site.register(SeatHold)
+admin.site.register(ArchivedOrder)
+admin.site.register(ArchivedTicket)
+admin.site.register(JourneySchedule)
+admin.site.register(CrewAssignment)
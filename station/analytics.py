@@ -0,0 +1,125 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, Q, Sum, Value, Window
+from django.db.models.functions import Cast, Greatest, Least, Rank, TruncDate
+
+from station.models import Journey, Train
+from station.tenancy import tenant_cache_key
+
+# Model fields and expressions identifying a group in the report, per `group_by`
+GROUPINGS = {
+    "journey": (
+        ("id", "departure_time"),
+        {"source": F("route__source__name"), "destination": F("route__destination__name")},
+    ),
+    "route": (
+        ("route_id", ),
+        {"source": F("route__source__name"), "destination": F("route__destination__name")},
+    ),
+    "train_type": (
+        (),
+        {"train_type_id": F("train__train_type_id"), "train_type": F("train__train_type__name")},
+    ),
+    "day": (
+        (),
+        {"day": TruncDate("departure_time")},
+    ),
+}
+
+
+def load_factors(group_by, departure_from=None, departure_to=None, limit=100, operator_id=None):
+    """
+    Sold seats against capacity per group, aggregated by the database from
+    the denormalized `Journey.seats_sold` counter, so no ticket rows are read.
+    Days come in chronological order, other groups busiest first.
+    """
+    queryset = Journey.objects.all()
+    if operator_id is not None:
+        queryset = queryset.filter(operator_id=operator_id)
+    if departure_from:
+        queryset = queryset.filter(departure_time__gte=departure_from)
+    if departure_to:
+        queryset = queryset.filter(departure_time__lt=departure_to)
+
+    sold = Sum("seats_sold")
+    capacity = Sum(F("train__cargo_num") * F("train__places_in_cargo"))
+    fields, expressions = GROUPINGS[group_by]
+    queryset = (
+        queryset.order_by()
+        .values(*fields, **expressions)
+        .annotate(
+            journeys=Count("id"),
+            sold=sold,
+            capacity=capacity,
+            load_factor=Cast(sold, FloatField()) / Cast(capacity, FloatField()),
+            rank=Window(Rank(), order_by=sold.desc()),
+        )
+    )
+    queryset = queryset.order_by("day") if group_by == "day" else queryset.order_by("rank")
+
+    return list(queryset[:limit])
+
+
+def train_utilization(period_start, period_end, limit=100, operator_id=None):
+    """
+    Share of the period each train spends running journeys, idle trains
+    included. Journeys are matched through the train/time index and
+    clipped to the period. Busiest trains come first.
+    """
+    in_period = Q(
+        journeys__departure_time__lt=period_end,
+        journeys__arrival_time__gt=period_start,
+    )
+    trains = Train.objects.all()
+    if operator_id is not None:
+        trains = trains.filter(operator_id=operator_id)
+    trains = (
+        trains.order_by()
+        .annotate(
+            journeys_in_period=Count("journeys", filter=in_period),
+            in_service=Sum(
+                Least(F("journeys__arrival_time"), Value(period_end))
+                - Greatest(F("journeys__departure_time"), Value(period_start)),
+                filter=in_period,
+            ),
+        )
+        .order_by(F("in_service").desc(nulls_last=True), "id")
+        .values("id", "name", "journeys_in_period", "in_service")[:limit]
+    )
+
+    period_seconds = (period_end - period_start).total_seconds()
+    report = []
+    for train in trains:
+        seconds = train["in_service"].total_seconds() if train["in_service"] else 0
+        report.append({
+            "train": train["id"],
+            "train_name": train["name"],
+            "journeys": train["journeys_in_period"],
+            "hours_in_service": round(seconds / 3600, 2),
+            "utilization": round(seconds / period_seconds, 4),
+        })
+    return report
+
+
+def _cached(name, report, **params):
+    key = tenant_cache_key(
+        params.get("operator_id"),
+        "analytics",
+        name,
+        hashlib.md5(repr(sorted(params.items())).encode()).hexdigest(),
+    )
+    return cache.get_or_set(
+        key, lambda: report(**params), settings.ANALYTICS_CACHE_SECONDS
+    )
+
+
+def cached_load_factors(**params):
+    """`load_factors` cached for ANALYTICS_CACHE_SECONDS per operator and parameter set"""
+    return _cached("load-factors", load_factors, **params)
+
+
+def cached_train_utilization(**params):
+    """`train_utilization` cached for ANALYTICS_CACHE_SECONDS per operator and parameter set"""
+    return _cached("train-utilization", train_utilization, **params)
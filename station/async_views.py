@@ -0,0 +1,200 @@
+import math
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, PermissionDenied, Throttled
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from station import seat_events
+from station.filters import filter_journeys, filter_stations
+from station.models import Journey, Station, Ticket, HeldSeat
+from station.serializers import JourneyListSerializer, StationListSerializer
+from station.tenancy import arequest_operator_id
+from station.throttling import acheck_throttles
+from user.authentication import (
+    acurrent_token_version,
+    check_token_version,
+    has_claims,
+    user_from_claims,
+)
+
+_jwt_authentication = JWTAuthentication()
+
+
+async def aauthenticate(request):
+    """Async counterpart of JWTAuthentication.authenticate."""
+    header = _jwt_authentication.get_header(request)
+    if header is None:
+        return None
+
+    raw_token = _jwt_authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    validated_token = _jwt_authentication.get_validated_token(raw_token)
+    if has_claims(validated_token):
+        check_token_version(
+            validated_token,
+            await acurrent_token_version(validated_token[api_settings.USER_ID_CLAIM]),
+        )
+        return user_from_claims(validated_token)
+
+    try:
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken("Token contained no recognizable user identification")
+
+    try:
+        user = await get_user_model().objects.aget(
+            **{api_settings.USER_ID_FIELD: user_id}
+        )
+    except get_user_model().DoesNotExist:
+        raise InvalidToken("User not found")
+
+    if not user.is_active:
+        raise InvalidToken("User is inactive")
+
+    return user
+
+
+def async_read_only_view(view):
+    """
+    Authenticate with JWT and allow safe methods for authenticated users,
+    mirroring IsAdminOrIfAuthenticatedReadOnly for read endpoints. Requests
+    count against the same throttles as the sync catalog endpoints.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return JsonResponse(
+                {"detail": f'Method "{request.method}" not allowed.'},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+
+        try:
+            user = await aauthenticate(request)
+        except (InvalidToken, TokenError) as error:
+            return JsonResponse(
+                {"detail": str(error)},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        if user is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        request.user = user
+        wait = await acheck_throttles(request, wrapper)
+        if wait is not None:
+            error = Throttled(wait)
+            response = JsonResponse({"detail": str(error.detail)}, status=error.status_code)
+            response["Retry-After"] = str(math.ceil(wait))
+            return response
+
+        try:
+            request.operator_id = await arequest_operator_id(request)
+        except (NotFound, PermissionDenied) as error:
+            return JsonResponse({"detail": str(error.detail)}, status=error.status_code)
+
+        return await view(request, *args, **kwargs)
+
+    wrapper.throttle_scope = "catalog"
+    return wrapper
+
+
+@async_read_only_view
+async def station_list(request):
+    """Get list of stations"""
+    queryset = filter_stations(Station.objects.all(), request.GET)
+    stations = [station async for station in queryset.aiterator()]
+
+    return JsonResponse(StationListSerializer(stations, many=True).data, safe=False)
+
+
+@async_read_only_view
+async def journey_list(request):
+    """Search journeys with the same filters as the journeys endpoint"""
+    queryset = Journey.objects.select_related(
+        "route__source",
+        "route__destination",
+        "train__train_type",
+    ).with_seat_counts().filter(operator_id=request.operator_id)
+    queryset = filter_journeys(queryset, request.GET)
+    journeys = [journey async for journey in queryset.aiterator()]
+
+    return JsonResponse(JourneyListSerializer(journeys, many=True).data, safe=False)
+
+
+async def _journey_seats(pk, operator_id):
+    try:
+        journey = await Journey.objects.select_related("train").aget(
+            pk=pk, operator_id=operator_id
+        )
+    except Journey.DoesNotExist:
+        return None
+
+    tickets = Ticket.objects.filter(journey_id=pk).values("cargo", "seat")
+    taken_seats = [ticket async for ticket in tickets.aiterator()]
+    held = HeldSeat.objects.active().filter(journey_id=pk).values("cargo", "seat")
+    held_seats = [seat async for seat in held.aiterator()]
+    number_of_seats = journey.train.number_of_seats
+
+    return {
+        "journey": journey.id,
+        "number_of_seats": number_of_seats,
+        "num_of_available_seats": number_of_seats - len(taken_seats) - len(held_seats),
+        "taken_seats": taken_seats,
+        "held_seats": held_seats,
+    }
+
+
+def _journey_not_found():
+    return JsonResponse(
+        {"detail": "No Journey matches the given query."},
+        status=status.HTTP_404_NOT_FOUND,
+    )
+
+
+@async_read_only_view
+async def journey_seats(request, pk):
+    """Get taken seats and number of available seats of a journey"""
+    seats = await _journey_seats(pk, request.operator_id)
+    if seats is None:
+        return _journey_not_found()
+
+    return JsonResponse(seats)
+
+
+@async_read_only_view
+async def journey_seat_events(request, pk):
+    """
+    Stream seat changes of a journey as Server-Sent Events: a `snapshot`
+    event first, then `seats_taken`/`seats_freed` deltas.
+    """
+    broker = seat_events.get_broker()
+    # Subscribe before reading the snapshot so no delta falls in between
+    subscription = broker.subscribe(pk)
+
+    seats = await _journey_seats(pk, request.operator_id)
+    if seats is None:
+        broker.unsubscribe(subscription)
+        return _journey_not_found()
+
+    response = StreamingHttpResponse(
+        seat_events.event_stream(
+            broker,
+            subscription,
+            {"type": seat_events.SNAPSHOT, **seats},
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
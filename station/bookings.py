@@ -0,0 +1,138 @@
+from collections import Counter
+
+from django.db.models import F, Q
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from station.models import Journey, Ticket, HeldSeat
+from station.seat_events import publish_seats_freed
+
+
+def _seats_filter(seats):
+    query = Q()
+    for journey_id, cargo, seat in seats:
+        query |= Q(journey_id=journey_id, cargo=cargo, seat=seat)
+    return query
+
+
+class SeatHoldExpired(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The seat hold has expired or was released."
+    default_code = "seat_hold_expired"
+
+
+def lock_journeys(journey_ids):
+    """
+    Lock journey rows in id order so that concurrent bookings of the same
+    journey (orders, holds, cancellations) run one after another.
+    """
+    list(
+        Journey.objects.select_for_update()
+        .filter(id__in=journey_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def _update_seats_sold(tickets, sign):
+    for journey_id, count in Counter(ticket.journey_id for ticket in tickets).items():
+        Journey.objects.filter(id=journey_id).update(
+            seats_sold=F("seats_sold") + sign * count
+        )
+
+
+def record_sold_seats(tickets):
+    """Increment `Journey.seats_sold` for newly created tickets."""
+    _update_seats_sold(tickets, 1)
+
+
+def reserve_seats(seats):
+    """
+    Make sure (journey_id, cargo, seat) triples are neither sold nor actively
+    held before they are booked. Expired holds on these seats are dropped.
+    Must be called inside a transaction.
+    """
+    seats = list(seats)
+    if len(set(seats)) != len(seats):
+        raise ValidationError({"seats": "The same seat is requested more than once"})
+
+    lock_journeys({journey_id for journey_id, _, _ in seats})
+    query = _seats_filter(seats)
+    HeldSeat.objects.expired().filter(query).delete()
+
+    unavailable = [
+        *Ticket.objects.filter(query).values_list("journey_id", "cargo", "seat"),
+        *HeldSeat.objects.filter(query).values_list("journey_id", "cargo", "seat"),
+    ]
+    if unavailable:
+        raise ValidationError({
+            "seats": [
+                f"Seat {seat} in cargo {cargo} of journey {journey_id} is not available"
+                for journey_id, cargo, seat in unavailable
+            ]
+        })
+
+
+def find_free_seats(taken, cargo_num, places_in_cargo, quantity, together=True):
+    """
+    Pick `quantity` free (cargo, seat) pairs given the set of taken ones.
+
+    With `together`, the first run of adjacent free seats inside one cargo
+    wins. Otherwise (or when no such run exists) the group is split over
+    the emptiest cargos so it stays in as few cargos as possible.
+    Returns None when the train has fewer free seats than requested.
+    """
+    free_by_cargo = {
+        cargo: [
+            seat for seat in range(1, places_in_cargo + 1)
+            if (cargo, seat) not in taken
+        ]
+        for cargo in range(1, cargo_num + 1)
+    }
+
+    if together:
+        for cargo, free in free_by_cargo.items():
+            for start in range(len(free) - quantity + 1):
+                run = free[start:start + quantity]
+                if run[-1] - run[0] == quantity - 1:
+                    return [(cargo, seat) for seat in run]
+
+    seats = []
+    for cargo, free in sorted(free_by_cargo.items(), key=lambda item: -len(item[1])):
+        seats.extend((cargo, seat) for seat in free[:quantity - len(seats)])
+        if len(seats) == quantity:
+            return seats
+    return None
+
+
+def assign_seats(journey, quantity, together=True):
+    """
+    Choose seats for a group booking using the journey's current seat map
+    (sold and actively held seats). Locks the journey, so the choice holds
+    until the surrounding transaction commits.
+    """
+    lock_journeys([journey.id])
+    taken = {
+        *Ticket.objects.filter(journey=journey).values_list("cargo", "seat"),
+        *HeldSeat.objects.active().filter(journey=journey).values_list("cargo", "seat"),
+    }
+    train = journey.train
+    seats = find_free_seats(taken, train.cargo_num, train.places_in_cargo, quantity, together)
+    if seats is None:
+        raise ValidationError({"quantity": f"Only {train.number_of_seats - len(taken)} seats are available"})
+    return seats
+
+
+def release_tickets(tickets):
+    """
+    Delete tickets with a single query and publish their seats as freed.
+    Journeys are locked first, so a concurrent booking of a just-freed seat
+    waits for the release and then sees it as available.
+    Must be called inside a transaction.
+    """
+    tickets = list(tickets.only("id", "journey_id", "cargo", "seat"))
+    lock_journeys({ticket.journey_id for ticket in tickets})
+    Ticket.objects.filter(id__in=[ticket.id for ticket in tickets]).delete()
+    _update_seats_sold(tickets, -1)
+    publish_seats_freed(tickets)
+    return tickets
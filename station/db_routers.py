@@ -0,0 +1,90 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_MODELS = {
+    "station.station",
+    "station.route",
+    "station.train",
+    "station.traintype",
+    "station.crew",
+    "station.journey",
+}
+
+_current_request = ContextVar("current_request", default=None)
+
+
+def set_current_request(request):
+    return _current_request.set({"request": request, "pinned": None})
+
+
+def reset_current_request(token):
+    _current_request.reset(token)
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def pin_to_primary(user):
+    """Send reads of this user to the primary until the replica catches up."""
+    cache.set(_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(user):
+    await cache.aset(_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return bool(cache.get(_pin_key(user.pk)))
+
+
+class ReplicaRouter:
+    """
+    Route safe-method reads of catalog and timetable models to the replica.
+
+    Everything else (writes, orders, tickets, users, management commands)
+    stays on the primary. A user who has just written is pinned to the
+    primary for ``REPLICA_PIN_SECONDS`` so they always read their own writes.
+    """
+
+    def _use_replica(self):
+        state = _current_request.get()
+        if state is None:
+            return False
+
+        request = state["request"]
+        if request.method not in SAFE_METHODS:
+            return False
+
+        if state["pinned"] is None:
+            user = getattr(request, "user", None)
+            if user is None or not user.is_authenticated:
+                return True
+            state["pinned"] = is_pinned_to_primary(user)
+
+        return not state["pinned"]
+
+    def db_for_read(self, model, **hints):
+        replica = settings.REPLICA_DATABASE_ALIAS
+        if not replica or model._meta.label_lower not in REPLICA_MODELS:
+            return None
+        if self._use_replica():
+            return replica
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", settings.REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.REPLICA_DATABASE_ALIAS:
+            return False
+        return None
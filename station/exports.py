@@ -0,0 +1,160 @@
+import csv
+import io
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import CharField, F, Func, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from station.models import ArchivedOrder, ArchivedTicket, Journey, Order, Ticket
+
+
+class IsoTimestamp(Func):
+    """A timestamp as ISO 8601 UTC text with milliseconds, the same on every backend"""
+    output_field = CharField()
+    template = """to_char(%(expressions)s AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.MS"Z"')"""
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="strftime('%%Y-%%m-%%dT%%H:%%M:%%fZ', %(expressions)s)",
+            **extra_context
+        )
+
+
+def _archived_tickets():
+    # The order of an archived ticket may still be hot or archived itself
+    order_created_at = Coalesce(
+        Subquery(Order.objects.filter(id=OuterRef("order_id")).values("created_at")[:1]),
+        Subquery(ArchivedOrder.objects.filter(id=OuterRef("order_id")).values("created_at")[:1]),
+    )
+    return ArchivedTicket.objects.order_by("id").annotate(order_created_at=order_created_at)
+
+
+# Per dataset: base queryset, exportable columns (name -> ORM lookup), the
+# timestamp columns, the field the `departure_from`/`departure_to` range
+# applies to, the operator the rows belong to and, where archive_bookings
+# moves rows away, the archive queryset with its own lookups
+DATASETS = {
+    "tickets": {
+        "queryset": lambda: Ticket.objects.order_by("id"),
+        "columns": {
+            "id": "id",
+            "order": "order_id",
+            "order_created_at": "order__created_at",
+            "journey": "journey_id",
+            "route": "journey__route_id",
+            "train": "journey__train_id",
+            "departure_time": "journey__departure_time",
+            "cargo": "cargo",
+            "seat": "seat",
+        },
+        "timestamps": {"order_created_at", "departure_time"},
+        "date_field": "journey__departure_time",
+        "operator_field": "journey__operator",
+        "archive": {
+            "queryset": _archived_tickets,
+            "columns": {
+                "id": "id",
+                "order": "order_id",
+                "order_created_at": "order_created_at",
+                "journey": "journey_id",
+                "route": "journey__route_id",
+                "train": "journey__train_id",
+                "departure_time": "journey__departure_time",
+                "cargo": "cargo",
+                "seat": "seat",
+            },
+        },
+    },
+    "journeys": {
+        "queryset": lambda: Journey.objects.order_by("id").annotate(
+            capacity=F("train__cargo_num") * F("train__places_in_cargo")
+        ),
+        "columns": {
+            "id": "id",
+            "route": "route_id",
+            "train": "train_id",
+            "departure_time": "departure_time",
+            "arrival_time": "arrival_time",
+            "capacity": "capacity",
+            "seats_sold": "seats_sold",
+        },
+        "timestamps": {"departure_time", "arrival_time"},
+        "date_field": "departure_time",
+        "operator_field": "operator",
+    },
+}
+
+
+def _select(config, columns, departure_from, departure_to, operator_id):
+    queryset = config["queryset"]()
+    date_field = config["date_field"]
+
+    if operator_id is not None:
+        queryset = queryset.filter(**{config["operator_field"]: operator_id})
+
+    if departure_from:
+        queryset = queryset.filter(**{f"{date_field}__gte": departure_from})
+    if departure_to:
+        queryset = queryset.filter(**{f"{date_field}__lt": departure_to})
+
+    lookups = config["columns"]
+    return queryset.values_list(*(
+        IsoTimestamp(lookups[column]) if column in config["timestamps"] else lookups[column]
+        for column in columns
+    ))
+
+
+def export_querysets(dataset, columns, departure_from=None, departure_to=None, operator_id=None):
+    """
+    Rows of `dataset` as tuples of the selected columns: archived rows, then
+    current ones, each in id order. Timestamps come as ISO 8601 UTC text.
+    """
+    config = DATASETS[dataset]
+    querysets = [_select(config, columns, departure_from, departure_to, operator_id)]
+    if "archive" in config:
+        archive = {**config, **config["archive"]}
+        querysets.insert(0, _select(archive, columns, departure_from, departure_to, operator_id))
+    return querysets
+
+
+def _copy_csv(queryset, connection):
+    sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", params) as copy:
+            for data in copy:
+                yield bytes(data)
+
+
+def _chunked_csv(queryset):
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    for number, row in enumerate(queryset.iterator(chunk_size=chunk_size), start=1):
+        writer.writerow(row)
+        if number % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_csv(querysets, columns):
+    """
+    Yield the export as CSV chunks without building model instances:
+    `COPY ... TO STDOUT` on Postgres, a server-side cursor elsewhere.
+    """
+    header = io.StringIO()
+    csv.writer(header, lineterminator="\n").writerow(columns)
+    yield header.getvalue()
+
+    for queryset in querysets:
+        using = router.db_for_read(queryset.model)
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            yield from _copy_csv(queryset.using(using), connection)
+        else:
+            yield from _chunked_csv(queryset.using(using))
@@ -0,0 +1,55 @@
+def params_to_ints(queryset):
+    """Convert a list of string IDs to a list of integers."""
+    return [int(str_id) for str_id in queryset.split(",") if str_id.isdigit()]
+
+
+def filter_stations(queryset, query_params):
+    """Filter stations by city names or IDs (ex. ?name=lviv,2)"""
+    name = query_params.get("name")
+
+    if name:
+        names = [city_name.strip() for city_name in name.split(",")]
+        name_ids = params_to_ints(name)
+        city = [city_name.capitalize() for city_name in names if not city_name.isdigit()]
+
+        if name_ids:
+            queryset = queryset.filter(id__in=name_ids)
+
+        if city:
+            queryset = queryset.filter(name__in=city)
+
+    return queryset.distinct()
+
+
+def filter_journeys(queryset, query_params):
+    """
+    Filter journeys by source, destination and train name or IDs, and by
+    minimum number of available seats (needs `with_seat_counts()`)
+    """
+    source = query_params.get("source")
+    destination = query_params.get("destination")
+    train_name = query_params.get("train_name")
+    min_available = query_params.get("min_available")
+
+    if source:
+        if source.isdigit():
+            queryset = queryset.filter(route__source__id__in=source)
+        else:
+            queryset = queryset.filter(route__source__name__icontains=source)
+
+    if destination:
+        if destination.isdigit():
+            queryset = queryset.filter(route__destination__id__in=destination)
+        else:
+            queryset = queryset.filter(route__destination__name__icontains=destination)
+
+    if train_name:
+        if train_name.isdigit():
+            queryset = queryset.filter(train__id__in=train_name)
+        else:
+            queryset = queryset.filter(train__name__icontains=train_name)
+
+    if min_available and min_available.isdigit():
+        queryset = queryset.filter(available_seats__gte=int(min_available))
+
+    return queryset.distinct()
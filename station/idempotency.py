@@ -0,0 +1,89 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from station.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class RequestInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress."
+    default_code = "idempotency_key_in_progress"
+
+
+class KeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+def request_fingerprint(request):
+    """Hash of what the request does, so a key cannot be reused for another one"""
+    payload = json.dumps(
+        [
+            request.method,
+            request.path,
+            getattr(request, "operator_id", None),
+            request.data,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def claim_key(user, key, fingerprint):
+    """
+    Return the stored response of the key, or claim the key for this request
+    and return None. The claim is a row under the unique (user, key)
+    constraint, so of concurrent duplicates only one runs, and it expires
+    after IDEMPOTENCY_LOCK_SECONDS if the request never completes.
+    """
+    if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+        raise ValidationError({IDEMPOTENCY_HEADER: "Ensure this header has no more than 255 characters."})
+
+    now = timezone.now()
+    record = IdempotencyKey.objects.filter(user=user, key=key, expires_at__gt=now).first()
+    if record is not None:
+        if record.status_code is None:
+            raise RequestInProgress()
+        if record.fingerprint != fingerprint:
+            raise KeyReused()
+        return record
+
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.filter(user=user, key=key, expires_at__lte=now).delete()
+            IdempotencyKey.objects.create(
+                user=user,
+                key=key,
+                fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+            )
+    except IntegrityError:
+        # A concurrent duplicate claimed it between the lookup and the insert
+        raise RequestInProgress()
+    return None
+
+
+def complete_key(user, key, response):
+    """Store the response of the claimed key for IDEMPOTENCY_KEY_TTL seconds"""
+    IdempotencyKey.objects.filter(user=user, key=key, status_code=None).update(
+        status_code=response.status_code,
+        response=response.data,
+        expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+    )
+
+
+def release_key(user, key):
+    """Drop the claim of a request that failed, so it can be retried"""
+    IdempotencyKey.objects.filter(user=user, key=key, status_code=None).delete()
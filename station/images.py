@@ -0,0 +1,55 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def _encode(image, image_format):
+    pillow_format, options = FORMATS[image_format]
+    if pillow_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = BytesIO()
+    image.save(buffer, pillow_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(image_field):
+    """
+    Resize an uploaded image to every size in IMAGE_VARIANT_SIZES and
+    encode each one as WebP and JPEG next to the original file.
+
+    Returns {size_name: {format: storage path}}.
+    """
+    storage = image_field.storage
+    root, _ = os.path.splitext(image_field.name)
+
+    with image_field.open("rb"), Image.open(image_field) as original:
+        original = ImageOps.exif_transpose(original)
+        variants = {}
+
+        for size_name, size in settings.IMAGE_VARIANT_SIZES.items():
+            resized = original.copy()
+            resized.thumbnail(size, Image.Resampling.LANCZOS)
+            variants[size_name] = {
+                image_format: storage.save(
+                    f"{root}-{size_name}.{image_format}",
+                    _encode(resized, image_format),
+                )
+                for image_format in FORMATS
+            }
+
+    return variants
+
+
+def delete_variants(storage, variants):
+    for formats in variants.values():
+        for path in formats.values():
+            storage.delete(path)
@@ -0,0 +1,12 @@
+def find_overlaps(intervals):
+    """
+    Yield (earlier, later) item pairs of overlapping (start, end, item)
+    intervals in one sorted pass: every interval that overlaps an earlier
+    one is paired with the earlier interval ending last.
+    """
+    latest = None
+    for interval in sorted(intervals, key=lambda interval: interval[:2]):
+        if latest is not None and interval[0] < latest[1]:
+            yield latest[2], interval[2]
+        if latest is None or interval[1] > latest[1]:
+            latest = interval
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from station.models import Ticket, Order, ArchivedTicket, ArchivedOrder
+
+
+def archive_tickets(cutoff, batch_size):
+    """
+    Move tickets of journeys departed before `cutoff` into ArchivedTicket,
+    one transaction per batch. Returns the number of moved tickets.
+    """
+    moved = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Ticket.objects.filter(journey__departure_time__lt=cutoff)
+                .order_by("id")
+                .values("id", "cargo", "seat", "journey_id", "order_id")[:batch_size]
+            )
+            if not rows:
+                return moved
+
+            ArchivedTicket.objects.bulk_create(
+                [ArchivedTicket(**row) for row in rows],
+                ignore_conflicts=True,
+            )
+            Ticket.objects.filter(id__in=[row["id"] for row in rows]).delete()
+            moved += len(rows)
+
+
+def archive_orders(cutoff, batch_size):
+    """
+    Move orders created before `cutoff` that have no hot tickets left into
+    ArchivedOrder. Returns the number of moved orders.
+    """
+    moved = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Order.objects.filter(created_at__lt=cutoff, tickets__isnull=True)
+                .order_by("id")
+                .values("id", "operator_id", "created_at", "cancelled_at", "user_id")[:batch_size]
+            )
+            if not rows:
+                return moved
+
+            ArchivedOrder.objects.bulk_create(
+                [ArchivedOrder(**row) for row in rows],
+                ignore_conflicts=True,
+            )
+            Order.objects.filter(id__in=[row["id"] for row in rows]).delete()
+            moved += len(rows)
+
+
+def average_row_bytes(model):
+    """
+    Average on-disk size of a row including its indexes and TOAST, from
+    Postgres statistics. None on other backends or before the first ANALYZE.
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_total_relation_size(oid), reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        total_bytes, rows = cursor.fetchone()
+    if rows <= 0:
+        return None
+    return total_bytes / rows
+
+
+class Command(BaseCommand):
+    help = "Move tickets of departed journeys and their finished orders into archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Archive tickets of journeys that departed more than DAYS ago",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows would be archived",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            tickets = Ticket.objects.filter(journey__departure_time__lt=cutoff).count()
+            # Orders whose tickets all belong to departed journeys become archivable
+            orders = (
+                Order.objects.filter(created_at__lt=cutoff)
+                .exclude(tickets__journey__departure_time__gte=cutoff)
+                .count()
+            )
+            action = "Would archive"
+        else:
+            tickets = archive_tickets(cutoff, options["batch_size"])
+            orders = archive_orders(cutoff, options["batch_size"])
+            action = "Archived"
+
+        self.stdout.write(f"{action} {tickets} tickets and {orders} orders")
+
+        reclaimed = [
+            (count, average_row_bytes(model))
+            for count, model in ((tickets, Ticket), (orders, Order))
+        ]
+        if all(row_bytes is not None for _, row_bytes in reclaimed):
+            megabytes = sum(count * row_bytes for count, row_bytes in reclaimed) / 1024 ** 2
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"~{megabytes:.1f} MB of hot table and index space reusable after VACUUM"
+                )
+            )
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+ENDPOINTS = [
+    ("stations", "station:station-list", "station:async-station-list"),
+    ("journeys", "station:journey-list", "station:async-journey-list"),
+]
+
+
+class Command(BaseCommand):
+    help = "Compare throughput of sync and async read endpoints under concurrency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email of the user to authenticate as")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options["email"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['email']} does not exist")
+
+        token = str(AccessToken.for_user(user))
+        no_throttling = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_CLASSES": []}
+
+        with override_settings(
+            REST_FRAMEWORK=no_throttling,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        ):
+            for name, sync_url_name, async_url_name in ENDPOINTS:
+                for kind, url_name in (("sync", sync_url_name), ("async", async_url_name)):
+                    elapsed = asyncio.run(self._run(
+                        reverse(url_name),
+                        token,
+                        options["requests"],
+                        options["concurrency"],
+                    ))
+                    self.stdout.write(
+                        f"{name:<10} {kind:<6} "
+                        f"{options['requests'] / elapsed:8.1f} req/s "
+                        f"({elapsed * 1000 / options['requests']:.2f} ms/req)"
+                    )
+
+    @staticmethod
+    async def _run(url, token, total, concurrency):
+        client = AsyncClient()
+        headers = {"Authorization": f"Bearer {token}"}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with semaphore:
+                response = await client.get(url, headers=headers)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(total)))
+        return time.perf_counter() - start
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from train_station_service.schema import write_schema_file
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema once so /api/doc/ serves it without introspection"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Where to write the schema (default: SCHEMA_FILE)")
+
+    def handle(self, *args, **options):
+        path = write_schema_file(options["file"])
+        self.stdout.write(self.style.SUCCESS(f"Schema written to {path}"))
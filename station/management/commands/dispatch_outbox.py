@@ -0,0 +1,54 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from station.models import OutboxEvent
+from station.outbox import dispatch_batch, get_sinks, outbox_lag
+
+
+def dispatch_pending(sinks, batch_size):
+    """Dispatch batches until the outbox is drained or a batch fails"""
+    dispatched = 0
+    while True:
+        sent = dispatch_batch(sinks, batch_size)
+        dispatched += sent
+        if sent < batch_size:
+            return dispatched
+
+
+class Command(BaseCommand):
+    help = "Send pending outbox events to the configured sinks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running and dispatch every INTERVAL seconds",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            help="Also delete events dispatched more than DAYS ago",
+        )
+
+    def handle(self, *args, **options):
+        sinks = get_sinks()
+        while True:
+            dispatched = dispatch_pending(sinks, options["batch_size"])
+            lag = outbox_lag()
+            self.stdout.write(
+                f"Dispatched {dispatched} events; "
+                f"{lag['pending']} pending, lag {lag['lag_seconds']}s"
+            )
+
+            if options["retention_days"] is not None:
+                OutboxEvent.objects.filter(
+                    dispatched_at__lt=timezone.now() - timedelta(days=options["retention_days"])
+                ).delete()
+
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from station.models import SeatHold, HeldSeat
+from station.seat_events import publish_seats_freed
+
+
+def expire_holds(batch_size):
+    """
+    Delete expired holds in batches walking the `expires_at` index and
+    publish the released seats. Returns the number of deleted holds.
+    """
+    now = timezone.now()
+    expired = 0
+
+    while True:
+        with transaction.atomic():
+            hold_ids = list(
+                SeatHold.objects.select_for_update(skip_locked=True)
+                .filter(expires_at__lte=now)
+                .order_by("expires_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not hold_ids:
+                return expired
+
+            publish_seats_freed(HeldSeat.objects.filter(hold_id__in=hold_ids))
+            HeldSeat.objects.filter(hold_id__in=hold_ids).delete()
+            SeatHold.objects.filter(id__in=hold_ids).delete()
+            expired += len(hold_ids)
+
+
+class Command(BaseCommand):
+    help = "Release seats of expired holds"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running and sweep every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_holds(options["batch_size"])
+            self.stdout.write(f"Expired {expired} seat holds")
+
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
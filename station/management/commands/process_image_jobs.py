@@ -0,0 +1,94 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from station.images import generate_variants, delete_variants
+from station.models import ImageJob
+
+
+def claim_jobs(batch_size):
+    """
+    Lock a batch of pending (or abandoned running) jobs and mark them running.
+    SKIP LOCKED lets several workers share the queue without blocking.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_JOB_TIMEOUT)
+
+    with transaction.atomic():
+        jobs = list(
+            ImageJob.objects.select_for_update(skip_locked=True)
+            .select_related("content_type")
+            .filter(
+                Q(status=ImageJob.Status.PENDING)
+                | Q(status=ImageJob.Status.RUNNING, claimed_at__lt=stale)
+            )
+            .order_by("created_at")[:batch_size]
+        )
+        ImageJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status=ImageJob.Status.RUNNING,
+            claimed_at=now,
+        )
+    return jobs
+
+
+def process_job(job):
+    model = job.content_type.model_class()
+    instance = model.objects.filter(pk=job.object_id).first()
+
+    # The object was deleted or got a newer image, which has its own job
+    if instance is None or instance.image.name != job.image:
+        return
+
+    variants = generate_variants(instance.image)
+    updated = model.objects.filter(pk=instance.pk, image=job.image).update(
+        image_variants=variants
+    )
+
+    if updated:
+        delete_variants(instance.image.storage, instance.image_variants)
+    else:
+        delete_variants(instance.image.storage, variants)
+
+
+def run_job(job):
+    job.attempts += 1
+    try:
+        process_job(job)
+    except Exception as error:
+        job.error = repr(error)
+        job.status = (
+            ImageJob.Status.FAILED
+            if job.attempts >= settings.IMAGE_JOB_MAX_ATTEMPTS
+            else ImageJob.Status.PENDING
+        )
+    else:
+        job.error = ""
+        job.status = ImageJob.Status.DONE
+    job.save(update_fields=["attempts", "error", "status"])
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails and WebP variants for uploaded station and train images"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--sleep", type=float, default=2, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = claim_jobs(options["batch_size"])
+
+            for job in jobs:
+                run_job(job)
+                self.stdout.write(f"{job}")
+
+            if not jobs:
+                if options["once"]:
+                    return
+                time.sleep(options["sleep"])
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from station.models import IdempotencyKey
+
+
+def purge_expired_keys(batch_size):
+    """
+    Delete expired idempotency keys in batches walking the `expires_at`
+    index. Returns the number of deleted keys.
+    """
+    now = timezone.now()
+    purged = 0
+
+    while True:
+        key_ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not key_ids:
+            return purged
+
+        IdempotencyKey.objects.filter(id__in=key_ids).delete()
+        purged += len(key_ids)
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys whose responses are no longer replayed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        purged = purge_expired_keys(options["batch_size"])
+        self.stdout.write(f"Purged {purged} idempotency keys")
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from station.bookings import lock_journeys
+from station.models import Journey, Ticket, ArchivedTicket, count_per_journey
+
+
+def sold_tickets():
+    # Archived tickets were sold too, so they still count towards the journey
+    return (
+        count_per_journey(Ticket.objects.all())
+        + count_per_journey(ArchivedTicket.objects.all())
+    )
+
+
+class Command(BaseCommand):
+    help = "Recompute Journey.seats_sold from tickets and report drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report journeys whose counter drifted",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        checked = drifted = 0
+
+        while True:
+            with transaction.atomic():
+                journey_ids = list(
+                    Journey.objects.filter(id__gt=last_id)
+                    .order_by("id")
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not journey_ids:
+                    break
+                last_id = journey_ids[-1]
+                checked += len(journey_ids)
+
+                # Bookings lock journeys too, so counts are stable while we compare
+                if not options["dry_run"]:
+                    lock_journeys(journey_ids)
+
+                drift = list(
+                    Journey.objects.filter(id__in=journey_ids)
+                    .annotate(actual=sold_tickets())
+                    .exclude(seats_sold=F("actual"))
+                    .values_list("id", "seats_sold", "actual")
+                )
+                for journey_id, stored, actual in drift:
+                    self.stdout.write(
+                        f"Journey {journey_id}: seats_sold={stored}, tickets={actual}"
+                    )
+                drifted += len(drift)
+
+                if drift and not options["dry_run"]:
+                    Journey.objects.filter(id__in=[row[0] for row in drift]).update(
+                        seats_sold=sold_tickets()
+                    )
+
+        action = "found" if options["dry_run"] else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} journeys, {action} {drifted} with drift")
+        )
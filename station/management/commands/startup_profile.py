@@ -0,0 +1,94 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker does before serving its first request
+STARTUP_SCRIPT = """
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (.+)")
+
+
+def profile_startup(env=None):
+    """
+    Start a fresh interpreter with `-X importtime` and run STARTUP_SCRIPT.
+    Returns the wall time in seconds and the self import time in
+    microseconds per imported module.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        raise CommandError(f"Start-up failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            modules[match.group(3).strip()] = int(match.group(1))
+    return elapsed, modules
+
+
+def by_package(modules):
+    """Self import time summed per top-level package, most expensive first"""
+    packages = Counter()
+    for name, self_us in modules.items():
+        packages[name.split(".")[0]] += self_us
+    return packages.most_common()
+
+
+class Command(BaseCommand):
+    help = "Report cold-start time of a worker and the packages its imports spend it on"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Start-ups to measure; the fastest is reported",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the start-up exceeds STARTUP_TIME_BUDGET_MS",
+        )
+
+    def handle(self, *args, **options):
+        elapsed, modules = min(
+            (profile_startup() for _ in range(options["runs"])),
+            key=lambda run: run[0],
+        )
+        elapsed_ms = elapsed * 1000
+        imports_ms = sum(modules.values()) / 1000
+
+        self.stdout.write(
+            f"Cold start {elapsed_ms:.0f} ms, {imports_ms:.0f} ms importing "
+            f"{len(modules)} modules"
+        )
+        for package, self_us in by_package(modules)[:options["top"]]:
+            self.stdout.write(f"{package:<30} {self_us / 1000:8.1f} ms")
+
+        budget_ms = settings.STARTUP_TIME_BUDGET_MS
+        if options["check"] and elapsed_ms > budget_ms:
+            raise CommandError(
+                f"Cold start took {elapsed_ms:.0f} ms, over the {budget_ms} ms budget"
+            )
@@ -0,0 +1,52 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework.permissions import SAFE_METHODS
+
+from station import db_routers
+
+
+class ReplicaRoutingMiddleware:
+    """Expose the current request to ReplicaRouter and pin writers to the primary."""
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = db_routers.set_current_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            db_routers.reset_current_request(token)
+
+        if self._wrote(request, response):
+            db_routers.pin_to_primary(request.user)
+
+        return response
+
+    async def __acall__(self, request):
+        token = db_routers.set_current_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            db_routers.reset_current_request(token)
+
+        if self._wrote(request, response):
+            await db_routers.apin_to_primary(request.user)
+
+        return response
+
+    @staticmethod
+    def _wrote(request, response):
+        user = getattr(request, "user", None)
+        return (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        )
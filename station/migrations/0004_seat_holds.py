@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-19 09:29
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0003_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('journey', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_holds', to='station.journey')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HeldSeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cargo', models.IntegerField()),
+                ('seat', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('journey', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='held_seats', to='station.journey')),
+                ('hold', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='station.seathold')),
+            ],
+            options={
+                'ordering': ['cargo', 'seat'],
+                'constraints': [models.UniqueConstraint(fields=('cargo', 'seat', 'journey'), name='unique_held_seat')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 09:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_seats_sold(apps, schema_editor):
+    Journey = apps.get_model("station", "Journey")
+    Ticket = apps.get_model("station", "Ticket")
+
+    tickets = (
+        Ticket.objects.filter(journey=OuterRef("pk"))
+        .order_by()
+        .values("journey")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Journey.objects.update(seats_sold=Coalesce(Subquery(tickets), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0005_order_cancelled_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journey',
+            name='seats_sold',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_seats_sold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0007_archived_bookings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journey',
+            index=models.Index(fields=['departure_time'], name='journey_departure_idx'),
+        ),
+    ]
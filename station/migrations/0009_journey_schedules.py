@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 09:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0008_journey_departure_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JourneySchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('departure_time', models.TimeField()),
+                ('duration', models.DurationField()),
+                ('days_of_week', models.JSONField(default=list)),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField()),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='station.route')),
+                ('train', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='station.train')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='journey',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='journeys', to='station.journeyschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='journey',
+            constraint=models.UniqueConstraint(fields=('schedule', 'departure_time'), name='unique_scheduled_journey'),
+        ),
+    ]
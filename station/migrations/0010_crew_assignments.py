@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 09:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0009_journey_schedules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrewAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('crew', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='station.crew')),
+                ('journey', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='crew_assignments', to='station.journey')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='journey',
+            name='crew',
+            field=models.ManyToManyField(blank=True, related_name='journeys', through='station.CrewAssignment', to='station.crew'),
+        ),
+        migrations.AddConstraint(
+            model_name='crewassignment',
+            constraint=models.UniqueConstraint(fields=('crew', 'journey'), name='unique_crew_assignment'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-19 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0010_crew_assignments'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journey',
+            index=models.Index(fields=['train', 'departure_time', 'arrival_time'], name='journey_train_time_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='journey',
+            constraint=models.CheckConstraint(condition=models.Q(('arrival_time__gt', models.F('departure_time'))), name='journey_arrival_after_departure'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2 on 2026-10-19 10:13
+
+import django.db.models.deletion
+import station.models
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import migrations, models
+
+
+def create_default_operator(apps, schema_editor):
+    """Create the operator existing rows and header-less requests belong to"""
+    Operator = apps.get_model("station", "Operator")
+    Operator.objects.get_or_create(
+        pk=settings.DEFAULT_OPERATOR_ID,
+        defaults={"name": "Default", "slug": "default"},
+    )
+    # The explicit primary key does not advance the sequence on Postgres
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Operator]):
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0011_journey_train_conflicts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Operator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('slug', models.SlugField(unique=True)),
+            ],
+        ),
+        migrations.RunPython(create_default_operator, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='route',
+            name='unique_routes',
+        ),
+        migrations.RemoveIndex(
+            model_name='journey',
+            name='journey_departure_idx',
+        ),
+        migrations.AddField(
+            model_name='journey',
+            name='operator',
+            field=models.ForeignKey(db_index=False, default=station.models.default_operator, on_delete=django.db.models.deletion.PROTECT, related_name='journeys', to='station.operator'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='operator',
+            field=models.ForeignKey(db_index=False, default=station.models.default_operator, on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='station.operator'),
+        ),
+        migrations.AddField(
+            model_name='route',
+            name='operator',
+            field=models.ForeignKey(db_index=False, default=station.models.default_operator, on_delete=django.db.models.deletion.PROTECT, related_name='routes', to='station.operator'),
+        ),
+        migrations.AddField(
+            model_name='train',
+            name='operator',
+            field=models.ForeignKey(default=station.models.default_operator, on_delete=django.db.models.deletion.PROTECT, related_name='trains', to='station.operator'),
+        ),
+        migrations.AddIndex(
+            model_name='journey',
+            index=models.Index(fields=['operator', 'departure_time'], name='journey_operator_departure_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['operator', 'user', '-created_at'], name='order_operator_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='route',
+            constraint=models.UniqueConstraint(fields=('operator', 'source', 'destination'), name='unique_routes'),
+        ),
+    ]
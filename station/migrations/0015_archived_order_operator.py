@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 10:36
+
+import django.db.models.deletion
+import station.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery
+
+
+def backfill_operator(apps, schema_editor):
+    """Archived orders belong to the operator of their archived tickets' journeys"""
+    ArchivedOrder = apps.get_model("station", "ArchivedOrder")
+    ArchivedTicket = apps.get_model("station", "ArchivedTicket")
+    ticket_operator = ArchivedTicket.objects.filter(order_id=OuterRef("pk")).values(
+        "journey__operator"
+    )[:1]
+    ArchivedOrder.objects.filter(
+        Exists(ArchivedTicket.objects.filter(order_id=OuterRef("pk")))
+    ).update(operator=Subquery(ticket_operator))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('station', '0014_outbox_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedorder',
+            name='operator',
+            field=models.ForeignKey(db_index=False, default=station.models.default_operator, on_delete=django.db.models.deletion.PROTECT, related_name='archived_orders', to='station.operator'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['operator', 'user', '-created_at'], name='archived_order_operator_idx'),
+        ),
+        migrations.RunPython(backfill_operator, migrations.RunPython.noop),
+    ]
@@ -1,33 +1,82 @@
+import hashlib
 import os
 import uuid
+from datetime import datetime, timedelta
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.text import slugify
 
 from train_station_service import settings
 
 
+class Operator(models.Model):
+    """Rail operator owning trains, routes, journeys and orders; the tenant."""
+    name = models.CharField(max_length=255, unique=True)
+    slug = models.SlugField(unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+def default_operator():
+    """Owner of rows created without an operator, created by the migrations"""
+    return settings.DEFAULT_OPERATOR_ID
+
+
+def operator_field(**kwargs):
+    return models.ForeignKey(
+        Operator,
+        on_delete=models.PROTECT,
+        default=default_operator,
+        **kwargs,
+    )
+
+
 class Route(models.Model):
+    # Indexed by the unique constraint, which leads with it
+    operator = operator_field(related_name="routes", db_index=False)
     source = models.ForeignKey("Station", on_delete=models.CASCADE, related_name="sources")
     destination = models.ForeignKey("Station", on_delete=models.CASCADE, related_name="destinations")
     distance = models.IntegerField(validators=[MinValueValidator(1)])
 
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["source", "destination"], name="unique_routes")
+            models.UniqueConstraint(fields=["operator", "source", "destination"], name="unique_routes")
         ]
 
     def __str__(self):
         return f"Route: {self.source} -> {self.destination} ({self.distance} km)"
 
 
-def station_image_file_path(instance, filename):
+def hashed_image_file_name(instance, filename):
+    """
+    `<slug>-<content hash><ext>`, so a file name never points at different
+    bytes and media can be cached as immutable. Falls back to a random
+    suffix when the content is not at hand.
+    """
     _, extension = os.path.splitext(filename)
-    filename = f"{slugify(instance.name)}-{uuid.uuid4()}{extension}"
+    image = instance.image
+    if image and not image._committed:
+        digest = hashlib.sha256()
+        for chunk in image.file.chunks():
+            digest.update(chunk)
+        image.file.seek(0)
+        suffix = digest.hexdigest()[:20]
+    else:
+        suffix = uuid.uuid4().hex
 
-    return os.path.join("uploads/stations/", filename)
+    return f"{slugify(instance.name)}-{suffix}{extension}"
+
+
+def station_image_file_path(instance, filename):
+    return os.path.join("uploads/stations/", hashed_image_file_name(instance, filename))
 
 
 class Station(models.Model):
@@ -39,6 +88,7 @@ class Station(models.Model):
         validators=[MinValueValidator(-180), MaxValueValidator(180)]
     )
     image = models.ImageField(null=True, upload_to=station_image_file_path)
+    image_variants = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return self.name
@@ -56,12 +106,98 @@ class Crew(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
+def count_per_journey(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.filter(journey=OuterRef("pk"))
+            .order_by()
+            .values("journey")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+class JourneyQuerySet(models.QuerySet):
+    def with_seat_counts(self):
+        """
+        Annotate actively held seats with one subquery and `available_seats`
+        from the denormalized `seats_sold` counter.
+        """
+        return self.annotate(
+            seats_held=count_per_journey(HeldSeat.objects.active()),
+            available_seats=(
+                F("train__cargo_num") * F("train__places_in_cargo")
+                - F("seats_sold")
+                - F("seats_held")
+            ),
+        )
+
+
+class JourneySchedule(models.Model):
+    """Recurring timetable entry that journeys are generated from."""
+    route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="schedules")
+    train = models.ForeignKey("Train", on_delete=models.CASCADE, related_name="schedules")
+    departure_time = models.TimeField()
+    duration = models.DurationField()
+    # Weekdays the train runs on, Monday is 0
+    days_of_week = models.JSONField(default=list)
+    valid_from = models.DateField()
+    valid_until = models.DateField()
+
+    def departures(self, date_from, date_to):
+        """Departure datetimes between the dates (inclusive) within the validity range"""
+        day = max(date_from, self.valid_from)
+        last_day = min(date_to, self.valid_until)
+        while day <= last_day:
+            if day.weekday() in self.days_of_week:
+                yield timezone.make_aware(datetime.combine(day, self.departure_time))
+            day += timedelta(days=1)
+
+    def __str__(self):
+        return (f"{self.route} at {self.departure_time}"
+                f" ({self.valid_from} - {self.valid_until})")
+
+
 class Journey(models.Model):
+    # Indexed by journey_operator_departure_idx, which leads with it
+    operator = operator_field(related_name="journeys", db_index=False)
     route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="journeys")
     train = models.ForeignKey("Train", on_delete=models.CASCADE, related_name="journeys")
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    schedule = models.ForeignKey(
+        JourneySchedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="journeys",
+    )
+    crew = models.ManyToManyField(
+        Crew,
+        through="CrewAssignment",
+        related_name="journeys",
+        blank=True,
+    )
+    # Kept in sync by station.bookings; `reconcile_seats_sold` repairs drift
+    seats_sold = models.PositiveIntegerField(default=0)
+
+    objects = JourneyQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["operator", "departure_time"], name="journey_operator_departure_idx"),
+            # Serves the overlap checks in station.schedules and train utilization
+            models.Index(fields=["train", "departure_time", "arrival_time"],
+                         name="journey_train_time_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["schedule", "departure_time"],
+                                    name="unique_scheduled_journey"),
+            models.CheckConstraint(condition=Q(arrival_time__gt=F("departure_time")),
+                                   name="journey_arrival_after_departure"),
+        ]
 
     def __str__(self):
             return (f"{self.route} departures at {self.departure_time}"
@@ -82,17 +218,20 @@ class Journey(models.Model):
 
     @property
     def num_of_available_seats(self):
-        return self.train.number_of_seats - Ticket.objects.filter(journey=self).count()
+        """Use the `with_seat_counts` annotation when the queryset provides it."""
+        seats_held = getattr(self, "seats_held", None)
+        if seats_held is None:
+            seats_held = HeldSeat.objects.active().filter(journey=self).count()
 
+        return self.train.number_of_seats - self.seats_sold - seats_held
 
-def train_image_file_path(instance, filename):
-    _, extension = os.path.splitext(filename)
-    filename = f"{slugify(instance.name)}-{uuid.uuid4()}{extension}"
 
-    return os.path.join("uploads/trains/", filename)
+def train_image_file_path(instance, filename):
+    return os.path.join("uploads/trains/", hashed_image_file_name(instance, filename))
 
 
 class Train(models.Model):
+    operator = operator_field(related_name="trains")
     name = models.CharField(max_length=255)
     cargo_num = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(40)]
@@ -102,6 +241,7 @@ class Train(models.Model):
     )
     train_type = models.ForeignKey("TrainType", on_delete=models.CASCADE, related_name="trains")
     image = models.ImageField(null=True, upload_to=train_image_file_path)
+    image_variants = models.JSONField(default=dict, blank=True)
 
     @property
     def number_of_seats(self):
@@ -175,7 +315,10 @@ class Ticket(models.Model):
 
 
 class Order(models.Model):
+    # Indexed by order_operator_user_idx, which leads with it
+    operator = operator_field(related_name="orders", db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
@@ -183,6 +326,10 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # A user's orders with one operator, newest first
+            models.Index(fields=["operator", "user", "-created_at"], name="order_operator_user_idx"),
+        ]
 
     @property
     def formatted_created_at(self):
@@ -190,3 +337,220 @@ class Order(models.Model):
 
     def __str__(self):
         return f"Order: {self.user} (created: {self.created_at})"
+
+
+class CrewAssignment(models.Model):
+    """A crew member working a journey; see station.rostering for overlap checks."""
+    crew = models.ForeignKey(Crew, on_delete=models.CASCADE, related_name="assignments")
+    journey = models.ForeignKey("Journey", on_delete=models.CASCADE, related_name="crew_assignments")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["crew", "journey"],
+                                    name="unique_crew_assignment"),
+        ]
+
+    def __str__(self):
+        return f"{self.crew} on journey {self.journey_id}"
+
+
+class ArchivedOrder(models.Model):
+    """Cold copy of an order whose tickets are all archived; keeps the original id."""
+    id = models.BigIntegerField(primary_key=True)
+    operator = operator_field(related_name="archived_orders", db_index=False)
+    created_at = models.DateTimeField()
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["operator", "user", "-created_at"], name="archived_order_operator_idx"
+            ),
+        ]
+
+    @property
+    def formatted_created_at(self):
+        return self.created_at.strftime("%d %B %Y, %I:%M %p")
+
+    def __str__(self):
+        return f"Archived order: {self.user} (created: {self.created_at})"
+
+
+class ArchivedTicket(models.Model):
+    """Cold copy of a ticket for a departed journey; keeps the original id."""
+    id = models.BigIntegerField(primary_key=True)
+    cargo = models.IntegerField(null=True, blank=True)
+    seat = models.IntegerField()
+    journey = models.ForeignKey("Journey", on_delete=models.CASCADE, related_name="archived_tickets")
+    # The order may still be hot while it has tickets for upcoming journeys
+    order_id = models.BigIntegerField(db_index=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["seat"]
+
+    def __str__(self):
+        return f"Archived ticket: {self.journey_id} (cargo: {self.cargo}, seat: {self.seat})"
+
+
+class SeatHold(models.Model):
+    """Seats of a journey reserved for a user until `expires_at`."""
+    journey = models.ForeignKey("Journey", on_delete=models.CASCADE, related_name="seat_holds")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def __str__(self):
+        return f"Hold: {self.user} on {self.journey_id} (expires: {self.expires_at})"
+
+
+class HeldSeatQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(hold__expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(hold__expires_at__lte=timezone.now())
+
+
+class HeldSeat(models.Model):
+    cargo = models.IntegerField()
+    seat = models.IntegerField(validators=[MinValueValidator(1)])
+    journey = models.ForeignKey("Journey", on_delete=models.CASCADE, related_name="held_seats")
+    hold = models.ForeignKey(SeatHold, on_delete=models.CASCADE, related_name="seats")
+
+    objects = HeldSeatQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["cargo", "seat", "journey"],
+                                    name="unique_held_seat"),
+        ]
+        ordering = ["cargo", "seat"]
+
+    def __str__(self):
+        return f"Held: {self.journey_id} (cargo: {self.cargo}, seat: {self.seat})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A create request made with an `Idempotency-Key` header: claimed while it
+    runs (`status_code` null), then its response, replayed to retries until
+    `expires_at`.
+    """
+    # Indexed by unique_idempotency_key, which leads with it
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="unique_idempotency_key"),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key: {self.user} {self.key} (expires: {self.expires_at})"
+
+
+class OutboxEvent(models.Model):
+    """
+    A change of an order or journey, written in the transaction that makes
+    it and sent to the sinks by `python manage.py dispatch_outbox`.
+    """
+    operator = operator_field(related_name="outbox_events", db_index=False)
+    aggregate_type = models.CharField(max_length=32)
+    aggregate_id = models.BigIntegerField()
+    event_type = models.CharField(max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Pending events in id order, kept small by leaving out sent ones
+            models.Index(
+                fields=["id"],
+                condition=Q(dispatched_at__isnull=True),
+                name="outbox_pending_idx",
+            ),
+        ]
+        ordering = ["id"]
+
+    def as_message(self):
+        return {
+            "id": self.id,
+            "operator": self.operator_id,
+            "aggregate_type": self.aggregate_type,
+            "aggregate_id": self.aggregate_id,
+            "type": self.event_type,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def __str__(self):
+        return f"{self.event_type}: {self.aggregate_type} {self.aggregate_id}"
+
+
+class ImageJob(models.Model):
+    """Queued generation of resized/WebP variants for an uploaded image."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    image = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="imagejob_status_created_idx"),
+        ]
+        ordering = ["created_at"]
+
+    @classmethod
+    def enqueue(cls, instance):
+        return cls.objects.create(
+            content_type=ContentType.objects.get_for_model(instance),
+            object_id=instance.pk,
+            image=instance.image.name,
+        )
+
+    def __str__(self):
+        return f"ImageJob: {self.content_type.model} {self.object_id} ({self.status})"
@@ -0,0 +1,144 @@
+import json
+import urllib.request
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from station.models import OutboxEvent
+
+ORDER = "order"
+JOURNEY = "journey"
+
+ORDER_CREATED = "order.created"
+ORDER_CANCELLED = "order.cancelled"
+TICKETS_CANCELLED = "order.tickets_cancelled"
+JOURNEY_CREATED = "journey.created"
+JOURNEY_UPDATED = "journey.updated"
+JOURNEY_DELETED = "journey.deleted"
+
+
+def _tickets_payload(tickets):
+    return [
+        {"id": ticket.id, "journey": ticket.journey_id, "cargo": ticket.cargo, "seat": ticket.seat}
+        for ticket in tickets
+    ]
+
+
+def order_event(order, event_type, tickets):
+    return OutboxEvent(
+        operator_id=order.operator_id,
+        aggregate_type=ORDER,
+        aggregate_id=order.id,
+        event_type=event_type,
+        payload={"order": order.id, "user": order.user_id, "tickets": _tickets_payload(tickets)},
+    )
+
+
+def journey_event(journey, event_type):
+    return OutboxEvent(
+        operator_id=journey.operator_id,
+        aggregate_type=JOURNEY,
+        aggregate_id=journey.id,
+        event_type=event_type,
+        payload={
+            "journey": journey.id,
+            "route": journey.route_id,
+            "train": journey.train_id,
+            "departure_time": journey.departure_time,
+            "arrival_time": journey.arrival_time,
+        },
+    )
+
+
+def record_events(events):
+    """
+    Write events with the change they describe. Call it inside that
+    transaction, after the aggregate's row is written: its row lock makes
+    concurrent writers of one aggregate take event ids in commit order.
+    """
+    OutboxEvent.objects.bulk_create(events)
+
+
+class FileSink:
+    """Append events to a file as JSON lines"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, messages):
+        with open(self.path, "a") as file:
+            for message in messages:
+                file.write(json.dumps(message, cls=DjangoJSONEncoder) + "\n")
+
+
+class WebhookSink:
+    """POST each batch as `{"events": [...]}`; any non-2xx answer fails the batch"""
+
+    def __init__(self, url, timeout=10, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def send(self, messages):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"events": messages}, cls=DjangoJSONEncoder).encode(),
+            headers=self.headers,
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_sinks():
+    return tuple(
+        import_string(sink["BACKEND"])(**sink.get("OPTIONS", {}))
+        for sink in settings.OUTBOX_SINKS
+    )
+
+
+def dispatch_batch(sinks, batch_size):
+    """
+    Send the oldest pending events to every sink, then mark them dispatched.
+    Events go out in id order and a batch is retried whole if a sink fails,
+    so delivery is at-least-once and ordered per aggregate. The batch stays
+    locked while it is sent, so a second dispatcher waits instead of
+    overtaking it. Returns the number of dispatched events.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update()
+            .filter(dispatched_at__isnull=True)
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        event_ids = [event.id for event in events]
+        messages = [event.as_message() for event in events]
+        try:
+            for sink in sinks:
+                sink.send(messages)
+        except Exception as exc:
+            OutboxEvent.objects.filter(id__in=event_ids).update(
+                attempts=F("attempts") + 1, error=repr(exc)
+            )
+            return 0
+
+        OutboxEvent.objects.filter(id__in=event_ids).update(dispatched_at=timezone.now(), error="")
+        return len(events)
+
+
+def outbox_lag():
+    """Pending events and age in seconds of the oldest one, the delivery lag"""
+    stats = OutboxEvent.objects.filter(dispatched_at__isnull=True).aggregate(
+        pending=Count("id"), oldest=Min("created_at")
+    )
+    lag = (timezone.now() - stats["oldest"]).total_seconds() if stats["oldest"] else 0
+    return {"pending": stats["pending"], "lag_seconds": round(lag, 3)}
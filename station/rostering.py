@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+from rest_framework.exceptions import ValidationError
+
+from station.intervals import find_overlaps
+from station.models import Crew, CrewAssignment
+
+
+def crew_conflicts(assignments, rescheduled=()):
+    """
+    Per-assignment errors for crew members who would work journeys with
+    overlapping times, checked against each other and, with one query,
+    against their existing assignments. Stored assignments to `rescheduled`
+    journeys are left out, as the given ones carry their new times.
+    """
+    crew_ids = {assignment["crew"].id for assignment in assignments}
+    window_start = min(assignment["journey"].departure_time for assignment in assignments)
+    window_end = max(assignment["journey"].arrival_time for assignment in assignments)
+
+    intervals = defaultdict(list)
+    existing = CrewAssignment.objects.filter(
+        crew_id__in=crew_ids,
+        journey__departure_time__lt=window_end,
+        journey__arrival_time__gt=window_start,
+    ).exclude(
+        journey_id__in=rescheduled
+    ).values_list("crew_id", "journey_id", "journey__departure_time", "journey__arrival_time")
+    for crew_id, journey_id, departure_time, arrival_time in existing:
+        intervals[crew_id].append((departure_time, arrival_time, (None, journey_id)))
+
+    for index, assignment in enumerate(assignments):
+        journey = assignment["journey"]
+        intervals[assignment["crew"].id].append(
+            (journey.departure_time, journey.arrival_time, (index, journey.id))
+        )
+
+    errors = [{} for _ in assignments]
+    for crew_id, crew_intervals in intervals.items():
+        for first, second in find_overlaps(crew_intervals):
+            for (index, _), (_, other_journey_id) in ((first, second), (second, first)):
+                if index is not None and not errors[index]:
+                    errors[index] = {
+                        "journey": [
+                            f"Crew member {crew_id} is already assigned to "
+                            f"journey {other_journey_id} at that time."
+                        ]
+                    }
+    return errors
+
+
+def lock_crew(crew_ids):
+    """Lock crew rows in id order, so rostering of the same people is serialized"""
+    list(
+        Crew.objects.select_for_update()
+        .filter(id__in=crew_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def check_crew_availability(journey):
+    """
+    Reject new times of a saved journey that overlap other assignments of
+    its crew. Must be called inside a transaction.
+    """
+    assignments = [
+        {"crew": assignment.crew, "journey": journey}
+        for assignment in journey.crew_assignments.select_related("crew")
+    ]
+    if not assignments:
+        return
+
+    lock_crew({assignment["crew"].id for assignment in assignments})
+    errors = crew_conflicts(assignments, rescheduled=[journey.id])
+    if any(errors):
+        raise ValidationError({
+            "departure_time": [message for error in errors if error for message in error["journey"]]
+        })
+
+
+def assign_crew(assignments):
+    """
+    Create crew assignments (dicts with `crew` and `journey`) unless one of
+    them conflicts. The crew rows are locked first, so concurrent rostering
+    of the same people is serialized. Returns the created assignments.
+    """
+    lock_crew({assignment["crew"].id for assignment in assignments})
+
+    errors = crew_conflicts(assignments)
+    if any(errors):
+        raise ValidationError(errors if len(errors) > 1 else errors[0])
+
+    return CrewAssignment.objects.bulk_create(
+        [CrewAssignment(**assignment) for assignment in assignments]
+    )
@@ -0,0 +1,155 @@
+from collections import defaultdict
+
+from rest_framework.exceptions import ValidationError
+
+from station.intervals import find_overlaps
+from station.models import Journey, JourneySchedule, Train
+from station.outbox import JOURNEY_CREATED, journey_event, record_events
+
+
+def train_conflicts(journeys):
+    """
+    Per-journey errors for trains that would run overlapping journeys,
+    checked against each other and, with one query on the train/time
+    index, against the trains' stored journeys. Journeys that are already
+    saved are not compared with their own stored row.
+    """
+    window_start = min(journey.departure_time for journey in journeys)
+    window_end = max(journey.arrival_time for journey in journeys)
+
+    intervals = defaultdict(list)
+    existing = Journey.objects.filter(
+        train_id__in={journey.train_id for journey in journeys},
+        departure_time__lt=window_end,
+        arrival_time__gt=window_start,
+    ).exclude(
+        pk__in=[journey.pk for journey in journeys if journey.pk]
+    ).values_list("id", "train_id", "departure_time", "arrival_time")
+    for journey_id, train_id, departure_time, arrival_time in existing:
+        intervals[train_id].append((departure_time, arrival_time, (None, journey_id)))
+
+    for index, journey in enumerate(journeys):
+        intervals[journey.train_id].append(
+            (journey.departure_time, journey.arrival_time, (index, journey.pk))
+        )
+
+    errors = [{} for _ in journeys]
+    for train_id, train_intervals in intervals.items():
+        for first, second in find_overlaps(train_intervals):
+            for (index, _), (_, other_journey_id) in ((first, second), (second, first)):
+                if index is not None and not errors[index]:
+                    other = f"journey {other_journey_id}" if other_journey_id else "another new journey"
+                    errors[index] = {
+                        "departure_time": [
+                            f"Train {train_id} already runs {other} at that time."
+                        ]
+                    }
+    return errors
+
+
+def check_train_availability(journeys):
+    """
+    Lock the trains of the journeys and raise ValidationError if any of
+    them would be double-booked, so concurrent writes are serialized.
+    """
+    list(
+        Train.objects.select_for_update()
+        .filter(id__in={journey.train_id for journey in journeys})
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+    errors = train_conflicts(journeys)
+    if any(errors):
+        raise ValidationError(errors if len(errors) > 1 else errors[0])
+
+
+def generate_journeys(schedule, date_from, date_to):
+    """
+    Create the schedule's journeys between the dates with one bulk insert,
+    skipping departures that already exist and rejecting the window if any
+    would double-book the train. Returns the created journeys.
+    Must be called inside a transaction.
+    """
+    departures = list(schedule.departures(date_from, date_to))
+    if not departures:
+        return []
+
+    # Runs for the same schedule take turns, so `existing` stays accurate
+    # until the insert and every inserted row is a new journey
+    list(JourneySchedule.objects.select_for_update().filter(pk=schedule.pk).values_list("pk"))
+
+    existing = set(
+        schedule.journeys.filter(
+            departure_time__range=(departures[0], departures[-1])
+        ).values_list("departure_time", flat=True)
+    )
+    journeys = [
+        Journey(
+            schedule=schedule,
+            operator_id=schedule.route.operator_id,
+            route_id=schedule.route_id,
+            train_id=schedule.train_id,
+            departure_time=departure,
+            arrival_time=departure + schedule.duration,
+        )
+        for departure in departures
+        if departure not in existing
+    ]
+    if not journeys:
+        return []
+
+    try:
+        check_train_availability(journeys)
+    except ValidationError as exc:
+        conflicts = exc.detail if isinstance(exc.detail, list) else [exc.detail]
+        raise ValidationError({
+            "departure_time": [
+                f"{journey.departure_time.isoformat()}: {error['departure_time'][0]}"
+                for journey, error in zip(journeys, conflicts)
+                if error
+            ]
+        })
+
+    created = Journey.objects.bulk_create(journeys)
+    record_events([journey_event(journey, JOURNEY_CREATED) for journey in created])
+    return created
+
+
+def expand_departures(schedules, date_from, date_to):
+    """
+    Departures of the schedules between the dates without materializing
+    them; `journey` is set for those that already exist.
+    """
+    schedules = list(schedules)
+    departures = [
+        (departure, schedule)
+        for schedule in schedules
+        for departure in schedule.departures(date_from, date_to)
+    ]
+    if not departures:
+        return []
+
+    first = min(departure for departure, _ in departures)
+    last = max(departure for departure, _ in departures)
+    journeys = {
+        (schedule_id, departure_time): journey_id
+        for journey_id, schedule_id, departure_time in Journey.objects.filter(
+            schedule__in=schedules,
+            departure_time__range=(first, last),
+        ).values_list("id", "schedule_id", "departure_time")
+    }
+    return sorted(
+        (
+            {
+                "schedule": schedule.id,
+                "route": schedule.route_id,
+                "train": schedule.train_id,
+                "departure_time": departure,
+                "arrival_time": departure + schedule.duration,
+                "journey": journeys.get((schedule.id, departure)),
+            }
+            for departure, schedule in departures
+        ),
+        key=lambda departure: departure["departure_time"],
+    )
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+SEATS_TAKEN = "seats_taken"
+SEATS_FREED = "seats_freed"
+SNAPSHOT = "snapshot"
+RESYNC = "resync"
+
+
+class Subscription:
+    """
+    Bounded queue of seat events for one journey, owned by one event loop.
+
+    A consumer that falls `max_queue_size` events behind loses its backlog
+    and gets a single `resync` event instead, so a slow client can never
+    make the broker buffer without limit.
+    """
+
+    def __init__(self, journey_id, max_queue_size):
+        self.journey_id = journey_id
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def put(self, event):
+        """Thread-safe: may be called from sync request threads."""
+        try:
+            self._loop.call_soon_threadsafe(self._put_nowait, event)
+        except RuntimeError:
+            # The consumer's event loop is already closed
+            pass
+
+    def _put_nowait(self, event):
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            event = {"type": RESYNC, "journey": self.journey_id}
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class InProcessBroker:
+    """
+    Fan out seat events to subscribers of the current process.
+
+    A multi-node deployment can plug in a broker backed by Redis pub/sub
+    (or similar) via SEAT_EVENTS_BROKER, implementing the same
+    subscribe/unsubscribe/publish interface.
+    """
+
+    def __init__(self, max_queue_size=None):
+        self.max_queue_size = max_queue_size or settings.SEAT_EVENTS_QUEUE_SIZE
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, journey_id):
+        subscription = Subscription(journey_id, self.max_queue_size)
+        with self._lock:
+            self._subscriptions[journey_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.journey_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.journey_id]
+
+    def publish(self, journey_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(journey_id, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.SEAT_EVENTS_BROKER)()
+
+
+def _seats_by_journey(tickets):
+    seats = defaultdict(list)
+    for ticket in tickets:
+        seats[ticket.journey_id].append({"cargo": ticket.cargo, "seat": ticket.seat})
+    return seats
+
+
+def _publish(event_type, tickets):
+    broker = get_broker()
+    for journey_id, seats in _seats_by_journey(tickets).items():
+        broker.publish(journey_id, {"type": event_type, "journey": journey_id, "seats": seats})
+
+
+def publish_seats_taken(tickets):
+    """Publish one event per journey once the current transaction commits."""
+    tickets = list(tickets)
+    transaction.on_commit(lambda: _publish(SEATS_TAKEN, tickets))
+
+
+def publish_seats_freed(tickets):
+    """Publish one event per journey once the current transaction commits."""
+    tickets = list(tickets)
+    transaction.on_commit(lambda: _publish(SEATS_FREED, tickets))
+
+
+def format_event(event):
+    """Encode an event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def event_stream(broker, subscription, snapshot, keepalive=None):
+    """
+    Yield the snapshot, then seat deltas with periodic keep-alive comments.
+    Unsubscribes when the client disconnects and the stream is closed.
+    """
+    keepalive = keepalive or settings.SEAT_EVENTS_KEEPALIVE
+    try:
+        yield format_event(snapshot)
+
+        while True:
+            try:
+                event = await subscription.get(timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
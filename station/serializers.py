@@ -1,42 +1,310 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator, UniqueTogetherValidator
 
 from station.models import (
+    Operator,
     Route,
     Station,
     Crew,
+    CrewAssignment,
     Journey,
+    JourneySchedule,
     Train,
     TrainType,
     Ticket,
     Order,
+    ArchivedOrder,
+    ArchivedTicket,
+    SeatHold,
+    HeldSeat,
+)
+from station.analytics import GROUPINGS
+from station.exports import DATASETS
+from station.bookings import assign_seats, reserve_seats, record_sold_seats
+from station.outbox import (
+    JOURNEY_CREATED,
+    JOURNEY_UPDATED,
+    ORDER_CREATED,
+    journey_event,
+    order_event,
+    record_events,
 )
+from station.rostering import assign_crew, check_crew_availability
+from station.schedules import check_train_availability
+from station.seat_events import publish_seats_taken
+from station.tenancy import has_operator
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Render stored variant paths as URLs: {size: {format: url}}"""
+
+    def to_representation(self, value):
+        storage = self.parent.Meta.model._meta.get_field("image").storage
+        request = self.context.get("request")
+        variants = {}
+
+        for size_name, formats in value.items():
+            variants[size_name] = {}
+            for image_format, path in formats.items():
+                url = storage.url(path)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                variants[size_name][image_format] = url
+
+        return variants
+
+
+class DynamicFieldsMixin:
+    """
+    Take `fields` to keep only the named fields and `expand` to embed the
+    related objects listed in `Meta.expandable_fields` ({name: serializer}).
+    """
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name in expand:
+            if name in expandable:
+                self.fields[name] = expandable[name](read_only=True)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields) - set(expand):
+                self.fields.pop(name)
+
+
+def _to_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _request_operator_id(context):
+    return getattr(context.get("request"), "operator_id", None)
+
+
+class CurrentOperatorDefault:
+    """Default for the hidden `operator` field: the request's operator"""
+    requires_context = True
+
+    def __call__(self, serializer_field):
+        operator_id = _request_operator_id(serializer_field.context)
+        return Operator(pk=operator_id or settings.DEFAULT_OPERATOR_ID)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class TenantPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Only accept objects of the request's operator, for models that have one"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        operator_id = _request_operator_id(self.context)
+        if operator_id is not None and has_operator(queryset.model):
+            queryset = queryset.filter(operator_id=operator_id)
+        return queryset
+
+
+class InBulkPrimaryKeyRelatedField(TenantPrimaryKeyRelatedField):
+    """Resolve against the objects BulkListSerializer preloaded, when it did"""
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get("in_bulk", {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool) or _to_pk(data) is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return preloaded[_to_pk(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validate a list payload with one `in_bulk` query per related field and
+    one query per unique constraint instead of per item, then write it with
+    `bulk_create`, or `bulk_update` when `instance` is a queryset to match
+    the items' `id` against.
+    """
+
+    def to_internal_value(self, data):
+        self._validated, self._targets = [], []
+        if isinstance(data, list):
+            items = [item for item in data if isinstance(item, dict)]
+            self._preload_related(items)
+            if self.instance is not None:
+                self._instances = self.instance.in_bulk(
+                    {_to_pk(item.get("id")) for item in items} - {None}
+                )
+            self._skip_unique_validators()
+
+        try:
+            super().to_internal_value(data)
+            errors = [{} for _ in self._validated]
+        except ValidationError as exc:
+            if not isinstance(exc.detail, list):
+                raise
+            errors = exc.detail
+
+        # Report conflicts of the valid items alongside the other errors
+        for index, error in enumerate(self._unique_errors()):
+            if error and not errors[index]:
+                errors[index] = error
+
+        if any(errors):
+            raise ValidationError(errors)
+        return self._validated
+
+    def run_child_validation(self, data):
+        instance = None
+        if self.instance is not None and isinstance(data, dict):
+            instance = self._instances.get(_to_pk(data.get("id")))
+            self.child.instance = instance
+            self.child.initial_data = data
+        self._targets.append(instance)
+        self._validated.append(None)
+
+        if self.instance is not None and instance is None:
+            raise ValidationError({"id": ["Object with this id does not exist."]})
+        self._validated[-1] = super().run_child_validation(data)
+        return self._validated[-1]
+
+    def _preload_related(self, items):
+        self._context["in_bulk"] = {
+            name: field.get_queryset().in_bulk(
+                {_to_pk(item.get(name)) for item in items} - {None}
+            )
+            for name, field in self.child.fields.items()
+            if isinstance(field, InBulkPrimaryKeyRelatedField) and not field.read_only
+        }
+
+    def _skip_unique_validators(self):
+        # Replaced by the batched check in _unique_errors
+        self.child.validators = [
+            validator for validator in self.child.validators
+            if not isinstance(validator, UniqueTogetherValidator)
+        ]
+        for field in self.child.fields.values():
+            field.validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+
+    def _unique_field_sets(self):
+        meta = self.child.Meta.model._meta
+        return [
+            (field.name, ) for field in meta.concrete_fields
+            if field.unique and not field.primary_key
+        ] + [
+            tuple(constraint.fields) for constraint in meta.total_unique_constraints
+        ]
+
+    def _unique_errors(self):
+        """Per-item errors for unique sets taken in the table or repeated in the payload"""
+        model = self.child.Meta.model
+        errors = [{} for _ in self._validated]
+
+        for fields in self._unique_field_sets():
+            rows = []
+            for attrs, instance in zip(self._validated, self._targets):
+                if attrs is None or not any(name in attrs for name in fields):
+                    rows.append(None)
+                    continue
+                rows.append(tuple(
+                    getattr(attrs[name], "pk", attrs[name]) if name in attrs
+                    else getattr(instance, model._meta.get_field(name).attname)
+                    for name in fields
+                ))
+
+            lookups = Q()
+            for values in filter(None, rows):
+                lookups |= Q(**dict(zip(fields, values)))
+            if not lookups:
+                continue
+
+            existing = model.objects.filter(lookups)
+            if self.instance is not None:
+                existing = existing.exclude(
+                    pk__in=[instance.pk for instance in self._targets if instance is not None]
+                )
+            taken = set(existing.values_list(*fields))
+
+            seen = set()
+            for index, values in enumerate(rows):
+                if values is None:
+                    continue
+                if values in taken or values in seen:
+                    errors[index].setdefault(api_settings.NON_FIELD_ERRORS_KEY, []).append(
+                        f"The fields {', '.join(fields)} must make a unique set."
+                        if len(fields) > 1
+                        else f"{model._meta.verbose_name} with this {fields[0]} already exists."
+                    )
+                seen.add(values)
+
+        return errors
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+    def update(self, instance, validated_data):
+        fields = set()
+        for target, attrs in zip(self._targets, validated_data):
+            for name, value in attrs.items():
+                setattr(target, name, value)
+                fields.add(name)
+
+        if fields:
+            self.child.Meta.model.objects.bulk_update(self._targets, fields)
+        return self._targets
+
 
+class RouteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    serializer_related_field = InBulkPrimaryKeyRelatedField
+    operator = serializers.HiddenField(default=CurrentOperatorDefault())
 
-class RouteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Route
-        fields = ("id", "source", "destination", "distance")
+        fields = ("id", "operator", "source", "destination", "distance")
+        list_serializer_class = BulkListSerializer
 
     def validate(self, attrs):
-        if attrs["source"] == attrs["destination"]:
+        source = attrs.get("source", getattr(self.instance, "source", None))
+        destination = attrs.get("destination", getattr(self.instance, "destination", None))
+        if source == destination:
             raise ValidationError(
                 "Source and destination must be different"
             )
         return attrs
 
 
-class StationSerializer(serializers.ModelSerializer):
+class StationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+
     class Meta:
         model = Station
-        fields = ("id", "name", "latitude", "longitude", "image")
+        fields = ("id", "name", "latitude", "longitude", "image", "image_variants")
+        list_serializer_class = BulkListSerializer
 
 
 class StationImageSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+
     class Meta:
         model = Station
-        fields = ("id", "image")
+        fields = ("id", "image", "image_variants")
 
 
 class StationListSerializer(StationSerializer):
@@ -63,36 +331,136 @@ class RouteDetailSerializer(RouteSerializer):
         fields = ("id", "source", "destination", "distance")
 
 
-class CrewSerializer(serializers.ModelSerializer):
+class CrewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Crew
         fields = ("id", "first_name", "last_name", "full_name")
 
 
-class JourneySerializer(serializers.ModelSerializer):
+class CrewRosterSerializer(BulkListSerializer):
+    def create(self, validated_data):
+        return assign_crew(validated_data)
+
+
+class CrewAssignmentSerializer(serializers.ModelSerializer):
+    serializer_related_field = InBulkPrimaryKeyRelatedField
+
+    class Meta:
+        model = CrewAssignment
+        fields = ("id", "crew", "journey")
+        list_serializer_class = CrewRosterSerializer
+
+    def create(self, validated_data):
+        return assign_crew([validated_data])[0]
+
+
+class JourneySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    serializer_related_field = TenantPrimaryKeyRelatedField
+    operator = serializers.HiddenField(default=CurrentOperatorDefault())
+
     class Meta:
         model = Journey
-        fields = ("id", "route", "train", "departure_time", "arrival_time")
+        fields = ("id", "operator", "route", "train", "departure_time", "arrival_time")
 
+    def validate(self, attrs):
+        departure_time = attrs.get("departure_time", getattr(self.instance, "departure_time", None))
+        arrival_time = attrs.get("arrival_time", getattr(self.instance, "arrival_time", None))
+        if arrival_time <= departure_time:
+            raise ValidationError({"arrival_time": "Must be later than departure_time"})
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            journey = Journey(**validated_data)
+            check_train_availability([journey])
+            journey.save()
+            record_events([journey_event(journey, JOURNEY_CREATED)])
+            return journey
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            rescheduled = any(
+                name in validated_data and validated_data[name] != getattr(instance, name)
+                for name in ("departure_time", "arrival_time")
+            )
+            for name, value in validated_data.items():
+                setattr(instance, name, value)
+            check_train_availability([instance])
+            if rescheduled:
+                check_crew_availability(instance)
+            instance.save()
+            record_events([journey_event(instance, JOURNEY_UPDATED)])
+            return instance
+
+
+class JourneyScheduleSerializer(serializers.ModelSerializer):
+    serializer_related_field = TenantPrimaryKeyRelatedField
+    days_of_week = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+    )
 
-class TrainTypeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JourneySchedule
+        fields = (
+            "id",
+            "route",
+            "train",
+            "departure_time",
+            "duration",
+            "days_of_week",
+            "valid_from",
+            "valid_until",
+        )
+
+    def validate_days_of_week(self, value):
+        return sorted(set(value))
+
+    def validate(self, attrs):
+        valid_from = attrs.get("valid_from", getattr(self.instance, "valid_from", None))
+        valid_until = attrs.get("valid_until", getattr(self.instance, "valid_until", None))
+        if valid_from > valid_until:
+            raise ValidationError({"valid_until": "Must not be earlier than valid_from"})
+        return attrs
+
+
+class ScheduleWindowSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    def validate(self, attrs):
+        days = (attrs["date_to"] - attrs["date_from"]).days
+        if days < 0:
+            raise ValidationError({"date_to": "Must not be earlier than date_from"})
+        if days >= settings.SCHEDULE_MAX_WINDOW_DAYS:
+            raise ValidationError(
+                f"The window must be shorter than {settings.SCHEDULE_MAX_WINDOW_DAYS} days"
+            )
+        return attrs
+
+
+class TrainTypeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TrainType
         fields = ("id", "name")
 
 
-class TrainSerializer(serializers.ModelSerializer):
-    train_type = serializers.PrimaryKeyRelatedField(queryset=TrainType.objects.all(), write_only=True)
+class TrainSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    train_type = InBulkPrimaryKeyRelatedField(queryset=TrainType.objects.all(), write_only=True)
+    operator = serializers.HiddenField(default=CurrentOperatorDefault())
 
     class Meta:
         model = Train
-        fields = ("id", "name", "cargo_num", "places_in_cargo", "train_type", "number_of_seats")
+        fields = ("id", "operator", "name", "cargo_num", "places_in_cargo", "train_type", "number_of_seats")
+        list_serializer_class = BulkListSerializer
 
 
 class TrainImageSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
+
     class Meta:
         model = Train
-        fields = ("id", "image")
+        fields = ("id", "image", "image_variants")
 
 
 class TrainListSerializer(TrainSerializer):
@@ -105,10 +473,11 @@ class TrainListSerializer(TrainSerializer):
 
 class TrainDetailSerializer(TrainSerializer):
     train_type = TrainTypeSerializer(read_only=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Train
-        fields = ("id", "name", "cargo_num", "places_in_cargo", "train_type", "number_of_seats", "image")
+        fields = ("id", "name", "cargo_num", "places_in_cargo", "train_type", "number_of_seats", "image", "image_variants")
 
 
 class JourneyListSerializer(JourneySerializer):
@@ -144,15 +513,21 @@ class JourneyListSerializer(JourneySerializer):
                   "arrival_time",
                   "duration"
                   )
+        expandable_fields = {
+            "route": RouteListSerializer,
+            "train": TrainListSerializer,
+        }
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    serializer_related_field = TenantPrimaryKeyRelatedField
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
+            attrs["seat"],
             attrs["cargo"],
-            attrs["places_in_cargo"].journey.train,
-            attrs["journey"],
+            attrs["journey"].train,
             ValidationError
         )
         return data
@@ -160,6 +535,7 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "cargo", "seat", "journey", "order")
+        read_only_fields = ("order",)
 
 
 class TicketSeatsSerializer(TicketSerializer):
@@ -168,6 +544,12 @@ class TicketSeatsSerializer(TicketSerializer):
         fields = ("cargo", "seat")
 
 
+class HeldSeatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HeldSeat
+        fields = ("cargo", "seat")
+
+
 class JourneyDetailSerializer(JourneySerializer):
     route = RouteDetailSerializer(read_only=True)
     train = TrainSerializer(read_only=True)
@@ -186,6 +568,8 @@ class JourneyDetailSerializer(JourneySerializer):
     taken_seats = TicketSeatsSerializer(
         source="tickets", many=True, read_only=True
     )
+    held_seats = serializers.SerializerMethodField()
+    crew = CrewSerializer(many=True, read_only=True)
 
     class Meta:
         model = Journey
@@ -196,33 +580,190 @@ class JourneyDetailSerializer(JourneySerializer):
                   "arrival_time",
                   "duration",
                   "taken_seats",
-                  "num_of_available_seats"
+                  "held_seats",
+                  "num_of_available_seats",
+                  "crew"
                   )
 
+    def get_held_seats(self, journey):
+        return HeldSeatSerializer(
+            HeldSeat.objects.active().filter(journey=journey), many=True
+        ).data
+
 
 class TicketListSerializer(TicketSerializer):
     journey = JourneyListSerializer(read_only=True)
 
 
-class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+class OrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False, required=False)
+    journey = TenantPrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train"),
+        write_only=True,
+        required=False,
+    )
+    quantity = serializers.IntegerField(min_value=1, write_only=True, required=False)
+    together = serializers.BooleanField(default=True, write_only=True)
     created_at = serializers.CharField(
         source="formatted_created_at",
         read_only=True,
     )
+    operator = serializers.HiddenField(default=CurrentOperatorDefault())
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "operator", "tickets", "journey", "quantity", "together", "created_at", "cancelled_at")
+        read_only_fields = ("cancelled_at",)
+
+    def validate(self, attrs):
+        """Either explicit tickets or `journey` and `quantity` for auto-assignment"""
+        auto_assign = "journey" in attrs or "quantity" in attrs
+        if ("tickets" in attrs) == auto_assign:
+            raise ValidationError(
+                "Provide either tickets or journey and quantity"
+            )
+        if auto_assign and not ("journey" in attrs and "quantity" in attrs):
+            raise ValidationError(
+                "Both journey and quantity are required for seat auto-assignment"
+            )
+        return attrs
 
     def create(self, validated_data):
         with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
+            tickets_data = validated_data.pop("tickets", None)
+            journey = validated_data.pop("journey", None)
+            quantity = validated_data.pop("quantity", None)
+            together = validated_data.pop("together")
+
+            if tickets_data is None:
+                tickets_data = [
+                    {"journey": journey, "cargo": cargo, "seat": seat}
+                    for cargo, seat in assign_seats(journey, quantity, together)
+                ]
+
+            reserve_seats(
+                (ticket_data["journey"].id, ticket_data["cargo"], ticket_data["seat"])
+                for ticket_data in tickets_data
+            )
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            # Seats were range-checked by validation or chosen by assign_seats,
+            # and reserve_seats checked them, so skip the per-row full_clean
+            tickets = Ticket.objects.bulk_create([
+                Ticket(order=order, **ticket_data)
+                for ticket_data in tickets_data
+            ])
+            record_sold_seats(tickets)
+            publish_seats_taken(tickets)
+            record_events([order_event(order, ORDER_CREATED, tickets)])
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class ArchivedTicketSerializer(serializers.ModelSerializer):
+    journey = JourneyListSerializer(read_only=True)
+
+    class Meta:
+        model = ArchivedTicket
+        fields = ("id", "cargo", "seat", "journey")
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """
+    Archived tickets of an order, which is itself archived (`archived`) or
+    still hot because it has tickets for upcoming journeys
+    """
+    tickets = ArchivedTicketSerializer(source="archived_ticket_list", many=True, read_only=True)
+    created_at = serializers.CharField(
+        source="formatted_created_at",
+        read_only=True,
+    )
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedOrder
+        fields = ("id", "tickets", "created_at", "cancelled_at", "archived")
+
+    def get_archived(self, order) -> bool:
+        return isinstance(order, ArchivedOrder)
+
+
+class OrderCancelTicketsSerializer(serializers.Serializer):
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    serializer_related_field = TenantPrimaryKeyRelatedField
+    seats = HeldSeatSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "journey", "seats", "created_at", "expires_at")
+        read_only_fields = ("created_at", "expires_at")
+
+    def validate(self, attrs):
+        for seat_data in attrs["seats"]:
+            Ticket.validate_ticket(
+                seat_data["seat"],
+                seat_data["cargo"],
+                attrs["journey"].train,
+                ValidationError
+            )
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            seats_data = validated_data.pop("seats")
+            journey = validated_data["journey"]
+            reserve_seats(
+                (journey.id, seat_data["cargo"], seat_data["seat"])
+                for seat_data in seats_data
+            )
+            hold = SeatHold.objects.create(
+                expires_at=timezone.now() + timedelta(seconds=settings.SEAT_HOLD_TTL),
+                **validated_data
+            )
+            seats = HeldSeat.objects.bulk_create([
+                HeldSeat(hold=hold, journey=journey, **seat_data)
+                for seat_data in seats_data
+            ])
+            publish_seats_taken(seats)
+            return hold
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    columns = serializers.CharField(required=False)
+    departure_from = serializers.DateTimeField(required=False)
+    departure_to = serializers.DateTimeField(required=False)
+
+    def validate_columns(self, value):
+        available = DATASETS[self.context["dataset"]]["columns"]
+        columns = [column.strip() for column in value.split(",") if column.strip()]
+        unknown = [column for column in columns if column not in available]
+        if unknown or not columns:
+            raise ValidationError(
+                f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(available)}"
+            )
+        return columns
+
+
+class LoadFactorParamsSerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=list(GROUPINGS), default="route")
+    departure_from = serializers.DateTimeField(required=False)
+    departure_to = serializers.DateTimeField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+
+
+class TrainUtilizationParamsSerializer(serializers.Serializer):
+    period_start = serializers.DateTimeField()
+    period_end = serializers.DateTimeField()
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+
+    def validate(self, attrs):
+        if attrs["period_end"] <= attrs["period_start"]:
+            raise ValidationError({"period_end": "Must be later than period_start"})
+        return attrs
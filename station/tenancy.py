@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from station.models import Operator
+
+OPERATOR_HEADER = "X-Operator"
+
+
+def operator_cache_key(slug):
+    return f"operator-slug:{slug}"
+
+
+def tenant_cache_key(operator_id, *parts):
+    """Cache key in the operator's namespace, so tenants never share entries"""
+    return ":".join(["operator", str(operator_id), *map(str, parts)])
+
+
+def has_operator(model):
+    """Whether rows of the model belong to an operator"""
+    return any(field.name == "operator" for field in model._meta.concrete_fields)
+
+
+def operator_id_for_slug(slug):
+    """Primary key of the operator with the slug, cached for OPERATOR_CACHE_SECONDS"""
+    operator_id = cache.get(operator_cache_key(slug))
+    if operator_id is None:
+        operator_id = Operator.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if operator_id is None:
+            raise NotFound(f'Unknown operator "{slug}".')
+        cache.set(operator_cache_key(slug), operator_id, settings.OPERATOR_CACHE_SECONDS)
+    return operator_id
+
+
+async def aoperator_id_for_slug(slug):
+    operator_id = await cache.aget(operator_cache_key(slug))
+    if operator_id is None:
+        operator_id = await Operator.objects.filter(slug=slug).values_list("id", flat=True).afirst()
+        if operator_id is None:
+            raise NotFound(f'Unknown operator "{slug}".')
+        await cache.aset(operator_cache_key(slug), operator_id, settings.OPERATOR_CACHE_SECONDS)
+    return operator_id
+
+
+def _resolve(user_operator_id, header_operator_id):
+    if user_operator_id is None:
+        return header_operator_id or settings.DEFAULT_OPERATOR_ID
+    if header_operator_id not in (None, user_operator_id):
+        raise PermissionDenied("You can only access your own operator.")
+    return user_operator_id
+
+
+def request_operator_id(request):
+    """
+    Operator the request works with: the one staff users belong to, else
+    the one named by the X-Operator header, else DEFAULT_OPERATOR_ID.
+    """
+    slug = request.headers.get(OPERATOR_HEADER)
+    return _resolve(
+        getattr(request.user, "operator_id", None),
+        operator_id_for_slug(slug) if slug else None,
+    )
+
+
+async def arequest_operator_id(request):
+    slug = request.headers.get(OPERATOR_HEADER)
+    return _resolve(
+        getattr(request.user, "operator_id", None),
+        await aoperator_id_for_slug(slug) if slug else None,
+    )
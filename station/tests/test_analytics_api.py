@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Journey
+from station.tests.test_journey_api import sample_journey, sample_route, sample_station, sample_train
+
+LOAD_FACTORS_URL = reverse("station:analytics-load-factors")
+UTILIZATION_URL = reverse("station:analytics-train-utilization")
+
+
+class AuthenticatedAnalyticsApiTests(TestCase):
+    """Test for authenticated analytics API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_admin_required(self):
+        res = self.client.get(LOAD_FACTORS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminAnalyticsApiTests(TestCase):
+    """Test for admin analytics API."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+        busy_route = sample_route(
+            source=sample_station(name="Kyiv"),
+            destination=sample_station(name="Lviv"),
+        )
+        self.busy = [
+            sample_journey(route=busy_route, seats_sold=500),
+            sample_journey(route=busy_route, seats_sold=300),
+        ]
+        self.quiet = sample_journey(seats_sold=100)
+
+    def test_load_factors_by_route(self):
+        res = self.client.get(LOAD_FACTORS_URL, {"group_by": "route"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        busiest = res.data[0]
+        self.assertEqual(busiest["source"], "Kyiv")
+        self.assertEqual(busiest["rank"], 1)
+        self.assertEqual(busiest["journeys"], 2)
+        self.assertEqual(busiest["sold"], 800)
+        self.assertEqual(busiest["capacity"], 2000)
+        self.assertAlmostEqual(busiest["load_factor"], 0.4)
+        self.assertEqual(res.data[1]["rank"], 2)
+
+    def test_load_factors_by_day(self):
+        Journey.objects.filter(id=self.quiet.id).update(
+            departure_time=self.quiet.departure_time + timedelta(days=1),
+            arrival_time=self.quiet.arrival_time + timedelta(days=1),
+        )
+
+        res = self.client.get(LOAD_FACTORS_URL, {"group_by": "day"})
+
+        self.assertEqual([row["sold"] for row in res.data], [800, 100])
+        self.assertLess(res.data[0]["day"], res.data[1]["day"])
+
+    def test_load_factors_are_cached(self):
+        self.client.get(LOAD_FACTORS_URL, {"group_by": "route"})
+        Journey.objects.update(seats_sold=0)
+
+        res = self.client.get(LOAD_FACTORS_URL, {"group_by": "route"})
+
+        self.assertEqual(res.data[0]["sold"], 800)
+
+    def test_invalid_group_by(self):
+        res = self.client.get(LOAD_FACTORS_URL, {"group_by": "weather"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_train_utilization(self):
+        journey = self.busy[0]
+        sample_journey(
+            train=journey.train,
+            departure_time=journey.arrival_time + timedelta(hours=1),
+        )
+        idle = sample_train(name="Idle")
+        period_start = journey.departure_time
+        # The second journey is clipped to one of its two hours
+        period_end = journey.arrival_time + timedelta(hours=2)
+
+        res = self.client.get(
+            UTILIZATION_URL,
+            {"period_start": period_start.isoformat(), "period_end": period_end.isoformat()},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["train"], journey.train.id)
+        self.assertEqual(res.data[0]["journeys"], 2)
+        self.assertEqual(res.data[0]["hours_in_service"], 3)
+        self.assertEqual(res.data[0]["utilization"], 0.75)
+        idle_row = next(row for row in res.data if row["train"] == idle.id)
+        self.assertEqual(idle_row["utilization"], 0)
+
+    def test_train_utilization_requires_period(self):
+        res = self.client.get(UTILIZATION_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,91 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from station.models import Journey, Order, Ticket, Station
+from station.serializers import JourneyListSerializer
+from station.tests.test_journey_api import sample_journey
+
+ASYNC_STATION_URL = reverse("station:async-station-list")
+ASYNC_JOURNEY_URL = reverse("station:async-journey-list")
+
+
+def seats_url(journey_id):
+    return reverse("station:async-journey-seats", args=[journey_id])
+
+
+class UnauthenticatedAsyncApiTests(TestCase):
+    """Test for unauthenticated async read API."""
+    async def test_auth_required(self):
+        res = await AsyncClient().get(ASYNC_JOURNEY_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_invalid_token(self):
+        res = await AsyncClient().get(
+            ASYNC_STATION_URL, headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedAsyncApiTests(TestCase):
+    """Test for authenticated async read API."""
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "async@test.com",
+            "password123",
+        )
+        token = AccessToken.for_user(self.user)
+        self.client = AsyncClient()
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    async def test_list_stations(self):
+        await Station.objects.acreate(name="Lviv", latitude=49, longitude=24)
+        await Station.objects.acreate(name="Kyiv", latitude=50, longitude=30)
+
+        res = await self.client.get(
+            ASYNC_STATION_URL, {"name": "lviv"}, headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([station["name"] for station in res.json()], ["Lviv"])
+
+    def test_list_journeys_matches_sync_endpoint(self):
+        sample_journey()
+        sample_journey()
+
+        res = async_to_sync(self.client.get)(ASYNC_JOURNEY_URL, headers=self.headers)
+
+        journeys = Journey.objects.order_by("id")
+        serializer = JourneyListSerializer(journeys, many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), serializer.data)
+
+    def test_journey_seats(self):
+        journey = sample_journey()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(journey=journey, order=order, cargo=1, seat=3)
+
+        res = async_to_sync(self.client.get)(
+            seats_url(journey.id), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["taken_seats"], [{"cargo": 1, "seat": 3}])
+        self.assertEqual(
+            res.json()["num_of_available_seats"],
+            journey.train.number_of_seats - 1,
+        )
+
+    async def test_journey_seats_not_found(self):
+        res = await self.client.get(seats_url(999), headers=self.headers)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_write_not_allowed(self):
+        res = await self.client.post(ASYNC_JOURNEY_URL, {}, headers=self.headers)
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,133 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Route, Station, Train
+from station.tests.test_journey_api import sample_station, sample_train, sample_train_type
+
+ROUTE_BULK_URL = reverse("station:route-bulk")
+STATION_BULK_URL = reverse("station:station-bulk")
+TRAIN_BULK_URL = reverse("station:train-bulk")
+
+
+class AuthenticatedBulkApiTests(TestCase):
+    """Test for authenticated bulk API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_forbidden(self):
+        res = self.client.post(
+            STATION_BULK_URL,
+            [{"name": "Odesa", "latitude": 46, "longitude": 30}],
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminBulkApiTests(TestCase):
+    """Test for admin bulk API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_stations(self):
+        payload = [
+            {"name": f"Station {number}", "latitude": 50, "longitude": 30}
+            for number in range(3)
+        ]
+
+        res = self.client.post(STATION_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 3)
+        self.assertEqual(Station.objects.count(), 3)
+
+    def test_bulk_create_stations_per_item_errors(self):
+        sample_station(name="Lviv")
+        payload = [
+            {"name": "Odesa", "latitude": 46, "longitude": 30},
+            {"name": "Lviv", "latitude": 49, "longitude": 24},
+            {"name": "Odesa", "latitude": 46, "longitude": 30},
+            {"name": "Kharkiv", "latitude": 200, "longitude": 36},
+        ]
+
+        res = self.client.post(STATION_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("non_field_errors", res.data[1])
+        self.assertIn("non_field_errors", res.data[2])
+        self.assertEqual(Station.objects.count(), 1)
+
+    def test_bulk_create_routes_resolves_stations_in_bulk(self):
+        stations = [sample_station(name=f"Station {number}") for number in range(4)]
+        payload = [
+            {"source": source.id, "destination": destination.id, "distance": 100}
+            for source, destination in zip(stations, stations[1:])
+        ]
+
+        # Two in_bulk lookups, one uniqueness check and one insert in a savepoint
+        with self.assertNumQueries(6):
+            res = self.client.post(ROUTE_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Route.objects.count(), 3)
+
+    def test_bulk_create_routes_invalid_items(self):
+        station = sample_station(name="Kyiv")
+        payload = [
+            {"source": station.id, "destination": station.id, "distance": 100},
+            {"source": station.id, "destination": 999, "distance": 100},
+        ]
+
+        res = self.client.post(ROUTE_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", res.data[0])
+        self.assertIn("destination", res.data[1])
+
+    def test_bulk_update_trains(self):
+        trains = [sample_train(name=f"Train {number}") for number in range(2)]
+        train_type = sample_train_type(name="Intercity")
+        payload = [
+            {"id": trains[0].id, "name": "Kyiv Express"},
+            {"id": trains[1].id, "train_type": train_type.id},
+        ]
+
+        res = self.client.patch(TRAIN_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        trains[0].refresh_from_db()
+        trains[1].refresh_from_db()
+        self.assertEqual(trains[0].name, "Kyiv Express")
+        self.assertEqual(trains[1].name, "Train 1")
+        self.assertEqual(trains[1].train_type, train_type)
+
+    def test_bulk_update_unknown_id(self):
+        res = self.client.patch(TRAIN_BULK_URL, [{"id": 999, "name": "Ghost"}], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", res.data[0])
+
+    def test_bulk_update_routes_keeps_unique_routes(self):
+        kyiv, lviv, odesa = (sample_station(name=name) for name in ("Kyiv", "Lviv", "Odesa"))
+        Route.objects.create(source=kyiv, destination=lviv, distance=500)
+        route = Route.objects.create(source=kyiv, destination=odesa, distance=400)
+
+        res = self.client.patch(
+            ROUTE_BULK_URL, [{"id": route.id, "destination": lviv.id}], format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Route.objects.get(id=route.id).destination, odesa)
@@ -0,0 +1,156 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Crew, CrewAssignment
+from station.tests.test_journey_api import sample_journey
+
+ASSIGNMENT_URL = reverse("station:crewassignment-list")
+ROSTER_URL = reverse("station:crewassignment-roster")
+
+
+def sample_crew(**params):
+    defaults = {
+        "first_name": "Taras",
+        "last_name": "Shevchenko",
+    }
+    defaults.update(params)
+
+    return Crew.objects.create(**defaults)
+
+
+def journey_at(hours_from_now, duration_hours=2):
+    departure_time = timezone.now() + timedelta(hours=hours_from_now)
+    return sample_journey(
+        departure_time=departure_time,
+        arrival_time=departure_time + timedelta(hours=duration_hours),
+    )
+
+
+class AuthenticatedCrewAssignmentApiTests(TestCase):
+    """Test for authenticated crew assignment API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_assignments_filtered_by_crew(self):
+        crew = sample_crew()
+        CrewAssignment.objects.create(crew=crew, journey=journey_at(1))
+        CrewAssignment.objects.create(crew=sample_crew(), journey=journey_at(1))
+
+        res = self.client.get(ASSIGNMENT_URL, {"crew": crew.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([assignment["crew"] for assignment in res.data], [crew.id])
+
+    def test_assign_forbidden(self):
+        res = self.client.post(
+            ASSIGNMENT_URL, {"crew": sample_crew().id, "journey": journey_at(1).id}
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminCrewAssignmentApiTests(TestCase):
+    """Test for admin crew assignment API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+        self.crew = sample_crew()
+
+    def test_assign_crew(self):
+        journey = journey_at(1)
+
+        res = self.client.post(ASSIGNMENT_URL, {"crew": self.crew.id, "journey": journey.id})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(journey.crew.all()), [self.crew])
+
+    def test_assign_crew_overlapping_journey(self):
+        first = journey_at(1)
+        CrewAssignment.objects.create(crew=self.crew, journey=first)
+
+        res = self.client.post(
+            ASSIGNMENT_URL, {"crew": self.crew.id, "journey": journey_at(2).id}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(first.id), res.data["journey"][0])
+
+    def test_roster_back_to_back_journeys(self):
+        payload = [
+            {"crew": self.crew.id, "journey": journey_at(1).id},
+            {"crew": self.crew.id, "journey": journey_at(3).id},
+            {"crew": sample_crew().id, "journey": journey_at(2).id},
+        ]
+
+        res = self.client.post(ROSTER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(CrewAssignment.objects.count(), 3)
+
+    def test_roster_reports_overlaps_per_item(self):
+        CrewAssignment.objects.create(crew=self.crew, journey=journey_at(10))
+        other_crew = sample_crew()
+        payload = [
+            {"crew": self.crew.id, "journey": journey_at(1).id},
+            {"crew": self.crew.id, "journey": journey_at(11).id},
+            {"crew": other_crew.id, "journey": journey_at(5).id},
+            {"crew": other_crew.id, "journey": journey_at(6).id},
+        ]
+
+        res = self.client.post(ROSTER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("journey", res.data[1])
+        self.assertIn("journey", res.data[2])
+        self.assertIn("journey", res.data[3])
+        self.assertEqual(CrewAssignment.objects.count(), 1)
+
+    def test_journey_detail_lists_crew(self):
+        journey = journey_at(1)
+        CrewAssignment.objects.create(crew=self.crew, journey=journey)
+
+        res = self.client.get(reverse("station:journey-detail", args=[journey.id]))
+
+        self.assertEqual([member["id"] for member in res.data["crew"]], [self.crew.id])
+
+    def test_reschedule_journey_into_crew_overlap(self):
+        first = journey_at(1)
+        second = journey_at(5)
+        CrewAssignment.objects.create(crew=self.crew, journey=first)
+        CrewAssignment.objects.create(crew=self.crew, journey=second)
+
+        res = self.client.patch(
+            reverse("station:journey-detail", args=[second.id]),
+            {"departure_time": first.departure_time + timedelta(hours=1)},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(first.id), res.data["departure_time"][0])
+
+    def test_reschedule_journey_within_own_slot(self):
+        journey = journey_at(5)
+        CrewAssignment.objects.create(crew=self.crew, journey=journey)
+
+        res = self.client.patch(
+            reverse("station:journey-detail", args=[journey.id]),
+            {"arrival_time": journey.arrival_time + timedelta(hours=1)},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+
+from station import db_routers
+from station.db_routers import ReplicaRouter
+from station.models import Station, Journey, Order, Ticket
+
+
+@override_settings(REPLICA_DATABASE_ALIAS="replica")
+class ReplicaRouterTests(TestCase):
+    """Test routing of reads between primary and replica."""
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = get_user_model().objects.create_user(
+            "router@test.com",
+            "password123",
+        )
+
+    def route_read(self, request, model):
+        token = db_routers.set_current_request(request)
+        try:
+            return self.router.db_for_read(model)
+        finally:
+            db_routers.reset_current_request(token)
+
+    def test_safe_catalog_reads_use_replica(self):
+        request = self.factory.get("/api/station/stations/")
+        request.user = self.user
+
+        self.assertEqual(self.route_read(request, Station), "replica")
+        self.assertEqual(self.route_read(request, Journey), "replica")
+
+    def test_orders_and_tickets_stay_on_primary(self):
+        request = self.factory.get("/api/station/orders/")
+        request.user = self.user
+
+        self.assertIsNone(self.route_read(request, Order))
+        self.assertIsNone(self.route_read(request, Ticket))
+
+    def test_unsafe_methods_read_from_primary(self):
+        request = self.factory.post("/api/station/stations/")
+        request.user = self.user
+
+        self.assertEqual(self.route_read(request, Station), "default")
+
+    def test_user_pinned_to_primary_after_write(self):
+        db_routers.pin_to_primary(self.user)
+        request = self.factory.get("/api/station/journeys/")
+        request.user = self.user
+
+        self.assertEqual(self.route_read(request, Journey), "default")
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Station), "default")
+
+    @override_settings(REPLICA_DATABASE_ALIAS=None)
+    def test_no_replica_configured(self):
+        request = self.factory.get("/api/station/stations/")
+        request.user = self.user
+
+        self.assertIsNone(self.route_read(request, Station))
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import ArchivedOrder, ArchivedTicket, Journey, Order, Ticket
+from station.tests.test_journey_api import sample_journey
+
+
+def export_url(dataset):
+    return reverse("station:export", args=[dataset])
+
+
+def read_csv(res):
+    return b"".join(res.streaming_content).decode().splitlines()
+
+
+class AuthenticatedExportApiTests(TestCase):
+    """Test for authenticated export API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_admin_required(self):
+        res = self.client.get(export_url("tickets"))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminExportApiTests(TestCase):
+    """Test for admin export API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2):
+            Ticket.objects.create(order=order, journey=self.journey, cargo=1, seat=seat)
+
+    def test_export_tickets_columns(self):
+        res = self.client.get(export_url("tickets"), {"columns": "journey,cargo,seat"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertEqual(
+            read_csv(res),
+            ["journey,cargo,seat", f"{self.journey.id},1,1", f"{self.journey.id},1,2"],
+        )
+
+    def test_export_journeys_date_range(self):
+        later = sample_journey(departure_time=self.journey.departure_time + timedelta(days=2))
+
+        res = self.client.get(
+            export_url("journeys"),
+            {
+                "columns": "id,capacity",
+                "departure_from": (later.departure_time - timedelta(days=1)).isoformat(),
+            },
+        )
+
+        self.assertEqual(read_csv(res), ["id,capacity", f"{later.id},{later.train.number_of_seats}"])
+
+    def test_export_unknown_column(self):
+        res = self.client.get(export_url("tickets"), {"columns": "id,price"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_unknown_dataset(self):
+        res = self.client.get(export_url("users"))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_tickets_includes_archived(self):
+        archived_order = ArchivedOrder.objects.create(
+            id=1000,
+            user=self.user,
+            created_at=datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc),
+        )
+        ArchivedTicket.objects.create(
+            id=5000, order_id=archived_order.id, journey=self.journey, cargo=2, seat=7
+        )
+
+        res = self.client.get(export_url("tickets"), {"columns": "id,order_created_at,seat"})
+
+        rows = read_csv(res)
+        self.assertEqual(rows[1], "5000,2025-01-02T03:04:05.678Z,7")
+        self.assertEqual(len(rows), 4)
+
+    def test_export_timestamps_iso(self):
+        Journey.objects.filter(id=self.journey.id).update(
+            departure_time=datetime(2025, 6, 1, 8, 30, tzinfo=timezone.utc)
+        )
+
+        res = self.client.get(export_url("journeys"), {"columns": "id,departure_time"})
+
+        self.assertEqual(read_csv(res)[1], f"{self.journey.id},2025-06-01T08:30:00.000Z")
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.idempotency import claim_key
+from station.models import IdempotencyKey, Order
+from station.tests.test_journey_api import sample_journey
+
+ORDER_URL = reverse("station:order-list")
+
+
+class IdempotentOrderTests(TestCase):
+    """Test order creation with an Idempotency-Key header."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+        self.payload = {"journey": self.journey.id, "quantity": 2}
+
+    def create_order(self, key, payload=None):
+        return self.client.post(
+            ORDER_URL,
+            payload or self.payload,
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.create_order("abc")
+
+        with self.assertNumQueries(1):
+            retry = self.create_order("abc")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_other_key_creates_new_order(self):
+        self.create_order("abc")
+        res = self.create_order("def")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_key_reused_for_other_request(self):
+        self.create_order("abc")
+        res = self.create_order("abc", {"journey": self.journey.id, "quantity": 3})
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_concurrent_duplicate_conflicts(self):
+        claim_key(self.user, "abc", "in-flight")
+
+        res = self.create_order("abc")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Order.objects.exists())
+
+    def test_failed_request_can_be_retried(self):
+        res = self.create_order("abc", {"journey": self.journey.id})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.create_order("abc")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_expired_key_runs_again(self):
+        self.create_order("abc")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        res = self.create_order("abc")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_purge_expired_keys(self):
+        self.create_order("abc")
+        self.create_order("def")
+        IdempotencyKey.objects.filter(key="abc").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        call_command("purge_idempotency_keys", stdout=StringIO())
+
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["def"])
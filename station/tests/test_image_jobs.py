@@ -0,0 +1,117 @@
+import tempfile
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import ImageJob, Station
+from station.tests.test_station_api import sample_station
+
+
+def image_upload_url(station_id):
+    return reverse("station:station-upload-image", args=[station_id])
+
+
+def sample_image(size=(2000, 1000)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color="red").save(buffer, "JPEG")
+    return SimpleUploadedFile("image.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+class StationImageJobTests(TestCase):
+    """Test background processing of uploaded station images."""
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com",
+            "password123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.user)
+        self.station = sample_station()
+
+    def test_upload_queues_job(self):
+        res = self.client.post(
+            image_upload_url(self.station.id),
+            {"image": sample_image()},
+            format="multipart",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data["image_variants"], {})
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, ImageJob.Status.PENDING)
+        self.assertEqual(job.object_id, self.station.id)
+
+    def test_worker_generates_variants(self):
+        self.client.post(
+            image_upload_url(self.station.id),
+            {"image": sample_image()},
+            format="multipart",
+        )
+
+        call_command("process_image_jobs", "--once", stdout=StringIO())
+
+        self.station.refresh_from_db()
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.Status.DONE)
+        self.assertEqual(set(self.station.image_variants), {"thumbnail", "medium"})
+
+        thumbnail = self.station.image_variants["thumbnail"]["webp"]
+        with self.station.image.storage.open(thumbnail) as file, Image.open(file) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 160))
+
+        res = self.client.get(reverse("station:station-detail", args=[self.station.id]))
+        self.assertTrue(res.data["image_variants"]["medium"]["jpeg"].startswith("http://"))
+
+    def test_stale_job_is_skipped(self):
+        self.client.post(
+            image_upload_url(self.station.id),
+            {"image": sample_image()},
+            format="multipart",
+        )
+        Station.objects.filter(id=self.station.id).update(image="uploads/stations/other.jpg")
+
+        call_command("process_image_jobs", "--once", stdout=StringIO())
+
+        self.station.refresh_from_db()
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.Status.DONE)
+        self.assertEqual(self.station.image_variants, {})
+
+    def test_replacing_image_deletes_old_variants(self):
+        self.client.post(
+            image_upload_url(self.station.id),
+            {"image": sample_image()},
+            format="multipart",
+        )
+        call_command("process_image_jobs", "--once", stdout=StringIO())
+        self.station.refresh_from_db()
+        storage = self.station.image.storage
+        old_paths = [
+            path for formats in self.station.image_variants.values() for path in formats.values()
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                image_upload_url(self.station.id),
+                {"image": sample_image(size=(1600, 900))},
+                format="multipart",
+            )
+        call_command("process_image_jobs", "--once", stdout=StringIO())
+
+        self.assertTrue(old_paths)
+        self.assertFalse(any(storage.exists(path) for path in old_paths))
+        self.station.refresh_from_db()
+        self.assertEqual(set(self.station.image_variants), {"thumbnail", "medium"})
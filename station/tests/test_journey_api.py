@@ -18,8 +18,8 @@ ROUTE_URL = reverse("station:route-list")
 def sample_journey(**params):
     route = sample_route()
     train = sample_train()
-    departure_time = timezone.now() + timedelta(hours=1)
-    arrival_time = timezone.now() + timedelta(hours=3)
+    departure_time = params.get("departure_time", timezone.now() + timedelta(hours=1))
+    arrival_time = departure_time + timedelta(hours=2)
 
     defaults = {
         "route": route,
@@ -166,6 +166,42 @@ class AuthenticatedJourneyApiTests(TestCase):
         self.assertIn(serializer1.data, res.data)
         self.assertNotIn(serializer2.data, res.data)
 
+    def test_filter_journeys_by_min_available(self):
+        small_train = sample_train(cargo_num=1, places_in_cargo=3)
+        journey1 = sample_journey(train=small_train, seats_sold=2)
+        journey2 = sample_journey(train=small_train, seats_sold=0)
+
+        res = self.client.get(JOURNEY_URL, {"min_available": 2})
+
+        serializer1 = JourneyListSerializer(journey1)
+        serializer2 = JourneyListSerializer(journey2)
+
+        self.assertNotIn(serializer1.data, res.data)
+        self.assertIn(serializer2.data, res.data)
+
+    def test_list_journeys_sparse_fields(self):
+        journey = sample_journey()
+        sample_journey()
+
+        # One narrow query without joins or seat count subqueries
+        with self.assertNumQueries(1):
+            res = self.client.get(JOURNEY_URL, {"fields": "id,departure_time"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data[0],
+            {"id": journey.id, "departure_time": journey.formatted_departure_time},
+        )
+
+    def test_list_journeys_expand(self):
+        journey = sample_journey()
+
+        res = self.client.get(JOURNEY_URL, {"fields": "id", "expand": "route,train"})
+
+        self.assertEqual(set(res.data[0]), {"id", "route", "train"})
+        self.assertEqual(res.data[0]["route"]["source"]["name"], journey.route.source.name)
+        self.assertEqual(res.data[0]["train"]["name"], journey.train.name)
+
 
 class AdminJourneyApiTests(TestCase):
     """Test for admin journey API."""
@@ -196,3 +232,47 @@ class AdminJourneyApiTests(TestCase):
         self.assertEqual(journey.train.id, train.id)
         self.assertEqual(journey.departure_time, payload["departure_time"])
         self.assertEqual(journey.arrival_time, payload["arrival_time"])
+
+    def test_create_journey_arrival_before_departure(self):
+        departure_time = timezone.now() + timedelta(hours=5)
+        payload = {
+            "route": sample_route().id,
+            "train": sample_train().id,
+            "departure_time": departure_time,
+            "arrival_time": departure_time - timedelta(hours=1),
+        }
+
+        res = self.client.post(JOURNEY_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_time", res.data)
+
+    def test_create_journey_train_double_booked(self):
+        journey = sample_journey()
+        payload = {
+            "route": sample_route().id,
+            "train": journey.train.id,
+            "departure_time": journey.departure_time + timedelta(hours=1),
+            "arrival_time": journey.arrival_time + timedelta(hours=1),
+        }
+
+        res = self.client.post(JOURNEY_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(journey.id), res.data["departure_time"][0])
+
+        payload["departure_time"] = journey.arrival_time
+        payload["arrival_time"] = journey.arrival_time + timedelta(hours=2)
+        res = self.client.post(JOURNEY_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_update_journey_keeps_own_slot(self):
+        journey = sample_journey()
+
+        res = self.client.patch(
+            reverse("station:journey-detail", args=[journey.id]),
+            {"arrival_time": journey.arrival_time + timedelta(minutes=30)},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import station_image_file_path
+from station.tests.test_image_jobs import sample_image
+from station.tests.test_station_api import sample_station
+
+
+def media_url(path):
+    return reverse("media", args=[path])
+
+
+class MediaServingTests(TestCase):
+    """Test serving uploaded media."""
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        os.makedirs(os.path.join(media_root.name, "uploads/stations"))
+        with open(os.path.join(media_root.name, "uploads/stations/kyiv.jpg"), "wb") as file:
+            file.write(b"image")
+        self.client = APIClient()
+
+    @override_settings(MEDIA_SERVING="file")
+    def test_file_streamed_with_immutable_caching(self):
+        res = self.client.get(media_url("uploads/stations/kyiv.jpg"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(res.streaming_content), b"image")
+        self.assertEqual(res["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", res["Cache-Control"])
+
+    @override_settings(MEDIA_SERVING="x-accel-redirect", MEDIA_ACCEL_PREFIX="/protected-media/")
+    def test_x_accel_redirect(self):
+        res = self.client.get(media_url("uploads/stations/kyiv.jpg"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.content, b"")
+        self.assertEqual(res["X-Accel-Redirect"], "/protected-media/uploads/stations/kyiv.jpg")
+        self.assertEqual(res["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", res["Cache-Control"])
+
+    @override_settings(MEDIA_SERVING="x-sendfile")
+    def test_x_sendfile(self):
+        res = self.client.get(media_url("uploads/stations/kyiv.jpg"))
+
+        self.assertEqual(res.content, b"")
+        self.assertTrue(res["X-Sendfile"].endswith("uploads/stations/kyiv.jpg"))
+
+    def test_missing_and_outside_files_not_found(self):
+        for path in ("uploads/stations/other.jpg", "uploads/stations", "../secret"):
+            res = self.client.get(f"/media/{path}")
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_upload_name_from_content_hash(self):
+        station = sample_station(name="Kyiv")
+        station.image = sample_image()
+        first = station_image_file_path(station, "photo.jpg")
+        station.image = sample_image()
+        second = station_image_file_path(station, "other.jpg")
+        station.image = sample_image(size=(10, 10))
+        third = station_image_file_path(station, "photo.jpg")
+
+        self.assertTrue(first.startswith("uploads/stations/kyiv-"))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
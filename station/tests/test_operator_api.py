@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Operator, Route
+from station.tests.test_journey_api import (
+    sample_journey,
+    sample_route,
+    sample_station,
+    sample_train,
+)
+
+JOURNEY_URL = reverse("station:journey-list")
+ROUTE_URL = reverse("station:route-list")
+ORDER_URL = reverse("station:order-list")
+LOAD_FACTORS_URL = reverse("station:analytics-load-factors")
+
+
+class OperatorIsolationTests(TestCase):
+    """Test that operators only see and reference their own rows."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.other = Operator.objects.create(name="Other", slug="other")
+
+        self.journey = sample_journey()
+        other_route = sample_route(operator=self.other)
+        other_train = sample_train(operator=self.other)
+        self.other_journey = sample_journey(
+            operator=self.other, route=other_route, train=other_train
+        )
+
+    def test_lists_are_scoped_by_header(self):
+        res = self.client.get(JOURNEY_URL)
+        self.assertEqual([item["id"] for item in res.data], [self.journey.id])
+
+        res = self.client.get(JOURNEY_URL, headers={"X-Operator": "other"})
+        self.assertEqual([item["id"] for item in res.data], [self.other_journey.id])
+
+    def test_other_operator_detail_not_found(self):
+        res = self.client.get(reverse("station:journey-detail", args=[self.other_journey.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unknown_operator(self):
+        res = self.client.get(JOURNEY_URL, headers={"X-Operator": "missing"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_journey_with_other_operator_route_rejected(self):
+        departure_time = timezone.now() + timedelta(days=1)
+        payload = {
+            "route": self.other_journey.route_id,
+            "train": self.journey.train_id,
+            "departure_time": departure_time,
+            "arrival_time": departure_time + timedelta(hours=2),
+        }
+
+        res = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("route", res.data)
+
+    def test_create_route_for_header_operator(self):
+        payload = {
+            "source": self.journey.route.source_id,
+            "destination": self.journey.route.destination_id,
+            "distance": 100,
+        }
+
+        res = self.client.post(ROUTE_URL, payload, headers={"X-Operator": "other"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Route.objects.get(id=res.data["id"]).operator, self.other)
+
+        res = self.client.post(ROUTE_URL, payload, headers={"X-Operator": "other"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_for_other_operator_journey_rejected(self):
+        payload = {"journey": self.other_journey.id, "quantity": 1}
+
+        res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("journey", res.data)
+
+    def test_analytics_cached_per_operator(self):
+        res = self.client.get(LOAD_FACTORS_URL, {"group_by": "journey"})
+        self.assertEqual([row["id"] for row in res.data], [self.journey.id])
+
+        res = self.client.get(
+            LOAD_FACTORS_URL, {"group_by": "journey"}, headers={"X-Operator": "other"}
+        )
+        self.assertEqual([row["id"] for row in res.data], [self.other_journey.id])
+
+
+class OperatorStaffTests(TestCase):
+    """Test users bound to an operator."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.other = Operator.objects.create(name="Other", slug="other")
+        self.user = get_user_model().objects.create_superuser(
+            "staff@other.com",
+            "testpass",
+            operator=self.other,
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_defaults_to_own_operator(self):
+        source = sample_station(name="Source")
+        destination = sample_station(name="Destination")
+        payload = {"source": source.id, "destination": destination.id, "distance": 10}
+
+        res = self.client.post(ROUTE_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Route.objects.get(id=res.data["id"]).operator, self.other)
+
+    def test_other_operator_header_forbidden(self):
+        res = self.client.get(JOURNEY_URL, headers={"X-Operator": "default"})
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
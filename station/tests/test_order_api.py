@@ -0,0 +1,276 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Order, Ticket, Journey, ArchivedOrder, ArchivedTicket
+from station.tests.test_journey_api import sample_journey
+
+ORDER_URL = reverse("station:order-list")
+ARCHIVED_ORDER_URL = reverse("station:order-archived")
+
+
+def cancel_url(order_id):
+    return reverse("station:order-cancel", args=[order_id])
+
+
+def cancel_tickets_url(order_id):
+    return reverse("station:order-cancel-tickets", args=[order_id])
+
+
+class UnauthenticatedOrderApiTests(TestCase):
+    """Test for unauthenticated order API."""
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(ORDER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedOrderApiTests(TestCase):
+    """Test for authenticated order API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "buyer@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def create_order(self, *seats, journey=None):
+        journey = journey or self.journey
+        payload = {
+            "tickets": [
+                {"cargo": cargo, "seat": seat, "journey": journey.id}
+                for cargo, seat in seats
+            ]
+        }
+        return self.client.post(ORDER_URL, payload, format="json")
+
+    def test_create_order(self):
+        res = self.create_order((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.tickets.count(), 2)
+
+    def test_create_order_seat_out_of_range(self):
+        res = self.create_order((1, self.journey.train.places_in_cargo + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def auto_assign(self, quantity, **params):
+        payload = {"journey": self.journey.id, "quantity": quantity, **params}
+        return self.client.post(ORDER_URL, payload, format="json")
+
+    def test_auto_assign_seats_together(self):
+        self.create_order((1, 2), (1, 5))
+
+        res = self.auto_assign(3)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted((ticket["cargo"], ticket["seat"]) for ticket in res.data["tickets"]),
+            [(1, 6), (1, 7), (1, 8)],
+        )
+
+    def test_auto_assign_splits_group_when_no_adjacent_seats(self):
+        train = self.journey.train
+        train.cargo_num = 2
+        train.places_in_cargo = 3
+        train.save()
+        self.create_order((1, 2), (2, 2))
+
+        res = self.auto_assign(3)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted((ticket["cargo"], ticket["seat"]) for ticket in res.data["tickets"]),
+            [(1, 1), (1, 3), (2, 1)],
+        )
+
+    def test_auto_assign_queries_do_not_grow_with_group(self):
+        with CaptureQueriesContext(connection) as small:
+            self.auto_assign(2)
+        with CaptureQueriesContext(connection) as large:
+            res = self.auto_assign(8)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(large), len(small))
+
+    def test_auto_assign_not_enough_seats(self):
+        train = self.journey.train
+        train.cargo_num = 1
+        train.places_in_cargo = 2
+        train.save()
+
+        res = self.auto_assign(3)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_auto_assign_requires_single_mode(self):
+        res = self.client.post(
+            ORDER_URL,
+            {"journey": self.journey.id, "tickets": [{"cargo": 1, "seat": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(ORDER_URL, {}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cancel_order_releases_seats(self):
+        order_id = self.create_order((1, 1), (1, 2)).data["id"]
+
+        res = self.client.post(cancel_url(order_id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(res.data["cancelled_at"])
+        self.assertFalse(Ticket.objects.exists())
+        self.assertEqual(self.create_order((1, 1)).status_code, status.HTTP_201_CREATED)
+
+    def test_cancel_order_twice(self):
+        order_id = self.create_order((1, 1)).data["id"]
+        self.client.post(cancel_url(order_id))
+
+        res = self.client.post(cancel_url(order_id))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cancel_some_tickets(self):
+        res = self.create_order((1, 1), (1, 2))
+        ticket_ids = [ticket["id"] for ticket in res.data["tickets"]]
+
+        res = self.client.post(
+            cancel_tickets_url(res.data["id"]),
+            {"tickets": ticket_ids[:1]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data["cancelled_at"])
+        self.assertEqual(list(Ticket.objects.values_list("id", flat=True)), ticket_ids[1:])
+
+    def test_cancel_foreign_ticket(self):
+        order_id = self.create_order((1, 1)).data["id"]
+        other_ticket_id = self.create_order((1, 2)).data["tickets"][0]["id"]
+
+        res = self.client.post(
+            cancel_tickets_url(order_id),
+            {"tickets": [other_ticket_id]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_cancel_departed_journey(self):
+        journey = sample_journey(departure_time=timezone.now() - timedelta(hours=1))
+        order_id = self.create_order((1, 1), journey=journey).data["id"]
+
+        res = self.client.post(cancel_url(order_id))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_seats_sold_counter(self):
+        res = self.create_order((1, 1), (1, 2), (1, 3))
+        ticket_id = res.data["tickets"][0]["id"]
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.seats_sold, 3)
+
+        self.client.post(
+            cancel_tickets_url(res.data["id"]),
+            {"tickets": [ticket_id]},
+            format="json",
+        )
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.seats_sold, 2)
+
+    def test_reconcile_seats_sold(self):
+        self.create_order((1, 1), (1, 2))
+        Journey.objects.filter(id=self.journey.id).update(seats_sold=7)
+
+        out = StringIO()
+        call_command("reconcile_seats_sold", "--dry-run", stdout=out)
+        self.journey.refresh_from_db()
+        self.assertIn(f"Journey {self.journey.id}: seats_sold=7, tickets=2", out.getvalue())
+        self.assertEqual(self.journey.seats_sold, 7)
+
+        call_command("reconcile_seats_sold", stdout=StringIO())
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.seats_sold, 2)
+
+    def test_archive_departed_bookings(self):
+        departed = sample_journey(departure_time=timezone.now() - timedelta(hours=1))
+        archived_order_id = self.create_order((1, 1), (1, 2), journey=departed).data["id"]
+        hot_order_id = self.create_order((1, 1)).data["id"]
+
+        out = StringIO()
+        call_command("archive_bookings", "--days", "0", "--dry-run", stdout=out)
+        self.assertIn("Would archive 2 tickets and 1 orders", out.getvalue())
+        self.assertEqual(Ticket.objects.count(), 3)
+
+        call_command("archive_bookings", "--days", "0", "--batch-size", "1", stdout=StringIO())
+
+        self.assertEqual(list(Order.objects.values_list("id", flat=True)), [hot_order_id])
+        self.assertEqual(list(ArchivedOrder.objects.values_list("id", flat=True)), [archived_order_id])
+        self.assertEqual(
+            list(ArchivedTicket.objects.filter(journey=departed).values_list("cargo", "seat")),
+            [(1, 1), (1, 2)],
+        )
+
+        call_command("reconcile_seats_sold", stdout=StringIO())
+        departed.refresh_from_db()
+        self.assertEqual(departed.seats_sold, 2)
+
+    def test_archived_orders_stay_visible(self):
+        departed = sample_journey(departure_time=timezone.now() - timedelta(hours=1))
+        archived_order_id = self.create_order((1, 1), journey=departed).data["id"]
+        payload = {
+            "tickets": [
+                {"cargo": 1, "seat": 2, "journey": departed.id},
+                {"cargo": 1, "seat": 1, "journey": self.journey.id},
+            ]
+        }
+        mixed_order_id = self.client.post(ORDER_URL, payload, format="json").data["id"]
+        other = get_user_model().objects.create_user("other@test.com", "password123")
+        Order.objects.create(user=other).tickets.create(journey=departed, cargo=1, seat=3)
+
+        call_command("archive_bookings", "--days", "0", stdout=StringIO())
+
+        res = self.client.get(ORDER_URL)
+        self.assertEqual([order["id"] for order in res.data], [mixed_order_id])
+        self.assertEqual(len(res.data[0]["tickets"]), 1)
+
+        res = self.client.get(ARCHIVED_ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(order["id"], order["archived"]) for order in res.data],
+            [(mixed_order_id, False), (archived_order_id, True)],
+        )
+        self.assertEqual(
+            [(ticket["seat"], ticket["journey"]["id"]) for ticket in res.data[0]["tickets"]],
+            [(2, departed.id)],
+        )
+        self.assertEqual(ArchivedOrder.objects.get(id=archived_order_id).operator_id, departed.operator_id)
+
+    def test_cancel_other_users_order(self):
+        other = get_user_model().objects.create_user("other@test.com", "password123")
+        order = Order.objects.create(user=other)
+
+        res = self.client.post(cancel_url(order.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
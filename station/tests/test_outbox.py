@@ -0,0 +1,150 @@
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import OutboxEvent
+from station.outbox import FileSink, dispatch_batch, outbox_lag
+from station.tests.test_journey_api import sample_journey
+
+ORDER_URL = reverse("station:order-list")
+JOURNEY_URL = reverse("station:journey-list")
+
+
+class RecordingSink:
+    def __init__(self):
+        self.messages = []
+
+    def send(self, messages):
+        self.messages.extend(messages)
+
+
+class FailingSink:
+    def send(self, messages):
+        raise ConnectionError("sink is down")
+
+
+class OutboxRecordingTests(TestCase):
+    """Test that booking and timetable changes write outbox events."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def events(self):
+        return list(OutboxEvent.objects.values_list("event_type", "aggregate_id"))
+
+    def test_order_created_and_cancelled(self):
+        res = self.client.post(
+            ORDER_URL, {"journey": self.journey.id, "quantity": 2}, format="json"
+        )
+        order_id = res.data["id"]
+        ticket_id = res.data["tickets"][0]["id"]
+
+        self.client.post(
+            reverse("station:order-cancel-tickets", args=[order_id]),
+            {"tickets": [ticket_id]},
+            format="json",
+        )
+        self.client.post(reverse("station:order-cancel", args=[order_id]))
+
+        self.assertEqual(self.events(), [
+            ("order.created", order_id),
+            ("order.tickets_cancelled", order_id),
+            ("order.cancelled", order_id),
+        ])
+        created = OutboxEvent.objects.first()
+        self.assertEqual(len(created.payload["tickets"]), 2)
+        self.assertEqual(created.operator_id, self.journey.operator_id)
+
+    def test_failed_order_writes_no_event(self):
+        self.client.post(ORDER_URL, {"journey": self.journey.id, "quantity": 10_000}, format="json")
+
+        self.assertEqual(self.events(), [])
+
+    def test_journey_changes(self):
+        departure_time = timezone.now() + timedelta(days=1)
+        payload = {
+            "route": self.journey.route_id,
+            "train": self.journey.train_id,
+            "departure_time": departure_time,
+            "arrival_time": departure_time + timedelta(hours=2),
+        }
+        res = self.client.post(JOURNEY_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        journey_url = reverse("station:journey-detail", args=[res.data["id"]])
+
+        self.client.patch(journey_url, {"arrival_time": departure_time + timedelta(hours=3)}, format="json")
+        self.client.delete(journey_url)
+
+        self.assertEqual(self.events(), [
+            ("journey.created", res.data["id"]),
+            ("journey.updated", res.data["id"]),
+            ("journey.deleted", res.data["id"]),
+        ])
+
+
+class OutboxDispatchTests(TestCase):
+    """Test sending outbox events to sinks."""
+    def setUp(self):
+        self.journeys = [sample_journey() for _ in range(3)]
+        OutboxEvent.objects.bulk_create([
+            OutboxEvent(
+                aggregate_type="journey",
+                aggregate_id=journey.id,
+                event_type="journey.created",
+                payload={"journey": journey.id},
+            )
+            for journey in self.journeys
+        ])
+
+    def test_dispatch_in_order_to_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "outbox.jsonl"
+
+        self.assertEqual(dispatch_batch([FileSink(path)], batch_size=2), 2)
+        self.assertEqual(dispatch_batch([FileSink(path)], batch_size=2), 1)
+
+        messages = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(
+            [message["aggregate_id"] for message in messages],
+            [journey.id for journey in self.journeys],
+        )
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_failed_batch_stays_pending(self):
+        sink = RecordingSink()
+
+        self.assertEqual(dispatch_batch([sink, FailingSink()], batch_size=10), 0)
+
+        self.assertEqual(outbox_lag()["pending"], 3)
+        event = OutboxEvent.objects.first()
+        self.assertEqual(event.attempts, 1)
+        self.assertIn("sink is down", event.error)
+
+        # Delivery is at-least-once: the retried batch reaches the sink again
+        self.assertEqual(dispatch_batch([sink], batch_size=10), 3)
+        self.assertEqual(len(sink.messages), 6)
+        self.assertEqual(outbox_lag(), {"pending": 0, "lag_seconds": 0})
+
+    def test_lag_of_oldest_pending_event(self):
+        OutboxEvent.objects.filter(id=OutboxEvent.objects.first().id).update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        lag = outbox_lag()
+
+        self.assertEqual(lag["pending"], 3)
+        self.assertGreaterEqual(lag["lag_seconds"], 300)
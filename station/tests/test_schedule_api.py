@@ -0,0 +1,159 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Journey, JourneySchedule, OutboxEvent
+from station.tests.test_journey_api import sample_journey, sample_route, sample_train
+
+SCHEDULE_URL = reverse("station:journeyschedule-list")
+DEPARTURES_URL = reverse("station:journeyschedule-departures")
+
+
+def generate_url(schedule_id):
+    return reverse("station:journeyschedule-generate", args=[schedule_id])
+
+
+def sample_schedule(**params):
+    defaults = {
+        "route": sample_route(),
+        "train": sample_train(),
+        "departure_time": time(8, 30),
+        "duration": timedelta(hours=5),
+        # Mondays and Fridays
+        "days_of_week": [0, 4],
+        "valid_from": date(2030, 1, 1),
+        "valid_until": date(2030, 12, 31),
+    }
+    defaults.update(params)
+
+    return JourneySchedule.objects.create(**defaults)
+
+
+class AuthenticatedScheduleApiTests(TestCase):
+    """Test for authenticated schedule API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+        self.schedule = sample_schedule()
+
+    def test_generate_forbidden(self):
+        res = self.client.post(
+            generate_url(self.schedule.id),
+            {"date_from": "2030-01-01", "date_to": "2030-01-31"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_departures_are_expanded_lazily(self):
+        res = self.client.get(
+            DEPARTURES_URL, {"date_from": "2030-01-06", "date_to": "2030-01-13"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # Monday 7th and Friday 11th of January 2030
+        self.assertEqual(
+            [departure["departure_time"].date() for departure in res.data],
+            [date(2030, 1, 7), date(2030, 1, 11)],
+        )
+        self.assertIsNone(res.data[0]["journey"])
+        self.assertFalse(Journey.objects.exists())
+
+    def test_departures_window_limit(self):
+        res = self.client.get(
+            DEPARTURES_URL, {"date_from": "2030-01-01", "date_to": "2032-01-01"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AdminScheduleApiTests(TestCase):
+    """Test for admin schedule API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_create_schedule(self):
+        payload = {
+            "route": sample_route().id,
+            "train": sample_train().id,
+            "departure_time": "08:30",
+            "duration": "05:00:00",
+            "days_of_week": [4, 0, 0],
+            "valid_from": "2030-01-01",
+            "valid_until": "2030-12-31",
+        }
+
+        res = self.client.post(SCHEDULE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(JourneySchedule.objects.get(id=res.data["id"]).days_of_week, [0, 4])
+
+    def test_create_schedule_invalid_validity(self):
+        payload = {
+            "route": sample_route().id,
+            "train": sample_train().id,
+            "departure_time": "08:30",
+            "duration": "05:00:00",
+            "days_of_week": [0],
+            "valid_from": "2030-12-31",
+            "valid_until": "2030-01-01",
+        }
+
+        res = self.client.post(SCHEDULE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_generate_journeys_idempotent(self):
+        schedule = sample_schedule(valid_until=date(2030, 1, 31))
+        window = {"date_from": "2029-12-01", "date_to": "2030-03-01"}
+
+        res = self.client.post(generate_url(schedule.id), window)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        # 4 Mondays and 4 Fridays in January 2030
+        self.assertEqual(res.data["created"], 8)
+        journey = Journey.objects.order_by("departure_time").first()
+        self.assertEqual(journey.departure_time.date(), date(2030, 1, 4))
+        self.assertEqual(journey.arrival_time - journey.departure_time, timedelta(hours=5))
+        self.assertEqual(journey.route_id, schedule.route_id)
+
+        res = self.client.post(generate_url(schedule.id), window)
+
+        self.assertEqual(res.data["created"], 0)
+        self.assertEqual(Journey.objects.count(), 8)
+        self.assertEqual(OutboxEvent.objects.filter(event_type="journey.created").count(), 8)
+
+    def test_departures_link_materialized_journeys(self):
+        schedule = sample_schedule()
+        window = {"date_from": "2030-01-06", "date_to": "2030-01-08"}
+        self.client.post(generate_url(schedule.id), window)
+
+        res = self.client.get(DEPARTURES_URL, window)
+
+        self.assertEqual(res.data[0]["journey"], Journey.objects.get().id)
+
+    def test_generate_journeys_train_conflict(self):
+        schedule = sample_schedule()
+        sample_journey(
+            train=schedule.train,
+            departure_time=datetime(2030, 1, 7, 10, tzinfo=timezone.utc),
+        )
+
+        res = self.client.post(
+            generate_url(schedule.id), {"date_from": "2030-01-01", "date_to": "2030-01-31"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data["departure_time"]), 1)
+        self.assertTrue(res.data["departure_time"][0].startswith("2030-01-07T08:30"))
+        self.assertEqual(Journey.objects.count(), 1)
@@ -0,0 +1,78 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station_service import schema
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaTests(TestCase):
+    """Test serving the cached OpenAPI schema."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.schema_file = os.path.join(directory.name, "schema.json")
+        settings_override = override_settings(SCHEMA_FILE=self.schema_file)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_schema_generated_once(self):
+        with mock.patch.object(
+            schema, "generate_schema", wraps=schema.generate_schema
+        ) as generate:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertIn(b"/api/station/journeys/", first.content)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_unchanged_schema_not_modified(self):
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_formats_have_own_etag(self):
+        yaml = self.client.get(SCHEMA_URL)
+        json = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertTrue(json["Content-Type"].startswith("application/vnd.oai.openapi+json"))
+        self.assertNotEqual(yaml["ETag"], json["ETag"])
+
+    def test_served_from_built_file(self):
+        call_command("build_schema", stdout=StringIO())
+
+        with mock.patch.object(schema, "generate_schema") as generate:
+            res = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        generate.assert_not_called()
+
+    def test_stale_file_regenerated(self):
+        call_command("build_schema", stdout=StringIO())
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        with mock.patch.object(schema, "code_fingerprint", return_value="changed"):
+            with mock.patch.object(
+                schema, "generate_schema", wraps=schema.generate_schema
+            ) as generate:
+                res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+        generate.assert_called_once()
@@ -0,0 +1,98 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station import seat_events
+from station.seat_events import InProcessBroker
+from station.tests.test_journey_api import sample_journey
+
+ORDER_URL = reverse("station:order-list")
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    """Test fan-out and backpressure of the in-process broker."""
+    async def test_publish_to_journey_subscribers(self):
+        broker = InProcessBroker(max_queue_size=10)
+        subscription = broker.subscribe(1)
+        other = broker.subscribe(2)
+
+        broker.publish(1, {"type": seat_events.SEATS_TAKEN, "journey": 1})
+
+        event = await subscription.get(timeout=1)
+        self.assertEqual(event["type"], seat_events.SEATS_TAKEN)
+        self.assertTrue(other._queue.empty())
+
+    async def test_slow_consumer_gets_resync(self):
+        broker = InProcessBroker(max_queue_size=2)
+        subscription = broker.subscribe(1)
+
+        for seat in range(3):
+            broker.publish(1, {"type": seat_events.SEATS_TAKEN, "seat": seat})
+        first = await subscription.get(timeout=1)
+
+        broker.publish(1, {"type": seat_events.SEATS_TAKEN, "seat": 3})
+        second = await subscription.get(timeout=1)
+
+        self.assertEqual(first["type"], seat_events.RESYNC)
+        self.assertTrue(subscription._queue.empty())
+        self.assertEqual(second["seat"], 3)
+
+    async def test_event_stream_unsubscribes_on_close(self):
+        broker = InProcessBroker(max_queue_size=10)
+        subscription = broker.subscribe(1)
+        stream = seat_events.event_stream(
+            broker, subscription, {"type": seat_events.SNAPSHOT, "journey": 1}
+        )
+
+        self.assertTrue((await anext(stream)).startswith("event: snapshot\n"))
+        broker.publish(1, {"type": seat_events.SEATS_FREED, "journey": 1})
+        self.assertTrue((await anext(stream)).startswith("event: seats_freed\n"))
+
+        await stream.aclose()
+        self.assertNotIn(1, broker._subscriptions)
+
+
+class SeatEventsPublishingTests(TestCase):
+    """Test that order creation publishes seat deltas."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "events@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_order_creation_publishes_seats_taken(self):
+        journey = sample_journey()
+        published = []
+        broker = seat_events.get_broker()
+        original_publish = broker.publish
+        broker.publish = lambda journey_id, event: published.append(event)
+        self.addCleanup(setattr, broker, "publish", original_publish)
+
+        payload = {
+            "tickets": [
+                {"cargo": 1, "seat": 1, "journey": journey.id},
+                {"cargo": 1, "seat": 2, "journey": journey.id},
+            ]
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0]["type"], seat_events.SEATS_TAKEN)
+        self.assertEqual(
+            published[0]["seats"],
+            [{"cargo": 1, "seat": 1}, {"cargo": 1, "seat": 2}],
+        )
+
+    def test_format_event(self):
+        message = seat_events.format_event({"type": "seats_taken", "journey": 1})
+
+        self.assertEqual(message.splitlines()[0], "event: seats_taken")
+        self.assertEqual(json.loads(message.splitlines()[1][len("data: "):])["journey"], 1)
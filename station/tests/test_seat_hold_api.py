@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import SeatHold, HeldSeat, Order, Journey
+from station.tests.test_journey_api import sample_journey
+
+HOLD_URL = reverse("station:seathold-list")
+ORDER_URL = reverse("station:order-list")
+
+
+def detail_url(hold_id):
+    return reverse("station:seathold-detail", args=[hold_id])
+
+
+def confirm_url(hold_id):
+    return reverse("station:seathold-confirm", args=[hold_id])
+
+
+class UnauthenticatedSeatHoldApiTests(TestCase):
+    """Test for unauthenticated seat hold API."""
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        res = self.client.get(HOLD_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthenticatedSeatHoldApiTests(TestCase):
+    """Test for authenticated seat hold API."""
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "holder@test.com",
+            "password123",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def hold_seats(self, *seats):
+        payload = {
+            "journey": self.journey.id,
+            "seats": [{"cargo": cargo, "seat": seat} for cargo, seat in seats],
+        }
+        return self.client.post(HOLD_URL, payload, format="json")
+
+    def available_seats(self):
+        return Journey.objects.with_seat_counts().get(id=self.journey.id).num_of_available_seats
+
+    def test_create_hold(self):
+        res = self.hold_seats((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(HeldSeat.objects.filter(hold_id=res.data["id"]).count(), 2)
+        self.assertEqual(self.available_seats(), self.journey.train.number_of_seats - 2)
+        self.assertEqual(self.journey.num_of_available_seats, self.journey.train.number_of_seats - 2)
+
+    def test_held_seat_cannot_be_held_or_ordered(self):
+        self.hold_seats((1, 1))
+
+        res_hold = self.hold_seats((1, 1))
+        res_order = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"cargo": 1, "seat": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res_hold.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res_order.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_confirm_hold_creates_order(self):
+        hold_id = self.hold_seats((2, 5), (2, 6)).data["id"]
+
+        res = self.client.post(confirm_url(hold_id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(
+            list(order.tickets.values_list("cargo", "seat")),
+            [(2, 5), (2, 6)],
+        )
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(self.available_seats(), self.journey.train.number_of_seats - 2)
+
+    def test_confirm_hold_after_seats_taken_over(self):
+        hold_id = self.hold_seats((1, 1)).data["id"]
+        SeatHold.objects.filter(id=hold_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+        other = get_user_model().objects.create_user("other@test.com", "password123")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.hold_seats((1, 1)).status_code, status.HTTP_201_CREATED)
+        self.client.force_authenticate(self.user)
+
+        res = self.client.post(confirm_url(hold_id))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Order.objects.exists())
+
+    def test_confirm_hold_of_departed_journey(self):
+        hold_id = self.hold_seats((1, 1)).data["id"]
+        Journey.objects.filter(id=self.journey.id).update(
+            departure_time=timezone.now() - timedelta(minutes=1)
+        )
+
+        res = self.client.post(confirm_url(hold_id))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_release_hold(self):
+        hold_id = self.hold_seats((1, 1)).data["id"]
+
+        res = self.client.delete(detail_url(hold_id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.available_seats(), self.journey.train.number_of_seats)
+
+    def test_expired_hold_releases_seats(self):
+        hold_id = self.hold_seats((1, 1)).data["id"]
+        SeatHold.objects.filter(id=hold_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(self.available_seats(), self.journey.train.number_of_seats)
+        self.assertEqual(self.client.post(confirm_url(hold_id)).status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.hold_seats((1, 1)).status_code, status.HTTP_201_CREATED)
+
+    def test_sweeper_deletes_expired_holds(self):
+        expired_id = self.hold_seats((1, 1)).data["id"]
+        active_id = self.hold_seats((1, 2)).data["id"]
+        SeatHold.objects.filter(id=expired_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        call_command("expire_seat_holds", stdout=StringIO())
+
+        self.assertEqual(list(SeatHold.objects.values_list("id", flat=True)), [active_id])
+        self.assertEqual(HeldSeat.objects.count(), 1)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from station.management.commands.startup_profile import profile_startup
+
+API_ONLY = {
+    "ADMIN_ENABLED": "false",
+    "API_DOCS_ENABLED": "false",
+    "DJANGO_DEBUG": "false",
+}
+
+# Wall-clock timing is noisy on shared CI machines, so the test allows a
+# generous multiple of the budget; `startup_profile --check` holds the exact one
+BUDGET_MARGIN = 3
+
+
+class StartupTests(SimpleTestCase):
+    """Guard the cold-start cost of workers."""
+    def test_api_only_start_skips_optional_apps(self):
+        _, modules = profile_startup(env=API_ONLY)
+
+        self.assertIn("station.views", modules)
+        for name in (
+            "debug_toolbar",
+            "drf_spectacular.openapi",
+            "train_station_service.schema",
+            "station.admin",
+            "user.admin",
+        ):
+            self.assertNotIn(name, modules)
+
+    def test_cold_start_within_budget(self):
+        elapsed, _ = profile_startup(env=API_ONLY)
+
+        self.assertLessEqual(elapsed * 1000, settings.STARTUP_TIME_BUDGET_MS * BUDGET_MARGIN)
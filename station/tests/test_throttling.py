@@ -0,0 +1,87 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from station.throttling import ScopedFixedWindowThrottle, UserFixedWindowThrottle
+
+ORDER_URL = reverse("station:order-list")
+STATION_URL = reverse("station:station-list")
+ASYNC_STATION_URL = reverse("station:async-station-list")
+ASYNC_JOURNEY_URL = reverse("station:async-journey-list")
+
+
+class ThrottlingTests(TestCase):
+    """Test fixed-window throttling."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    @mock.patch.dict(ScopedFixedWindowThrottle.THROTTLE_RATES, {"order_create": "2/minute"})
+    def test_order_create_limited_per_action(self):
+        for _ in range(2):
+            res = self.client.post(ORDER_URL, {}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(ORDER_URL, {}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+        res = self.client.get(ORDER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @mock.patch.dict(ScopedFixedWindowThrottle.THROTTLE_RATES, {"catalog": "3/minute"})
+    def test_catalog_reads_limited_per_user(self):
+        for _ in range(3):
+            res = self.client.get(STATION_URL)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.client.get(STATION_URL).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+        other = get_user_model().objects.create_user("other@test.com", "testpass")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(STATION_URL).status_code, status.HTTP_200_OK)
+
+    @mock.patch.dict(ScopedFixedWindowThrottle.THROTTLE_RATES, {"catalog": "3/minute"})
+    def test_async_reads_share_catalog_limit(self):
+        async_client = AsyncClient()
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        for _ in range(2):
+            self.assertEqual(self.client.get(STATION_URL).status_code, status.HTTP_200_OK)
+
+        res = async_to_sync(async_client.get)(ASYNC_JOURNEY_URL, headers=headers)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = async_to_sync(async_client.get)(ASYNC_STATION_URL, headers=headers)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+        self.assertEqual(
+            self.client.get(STATION_URL).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+    def test_window_stored_as_single_counter(self):
+        for _ in range(5):
+            self.client.get(STATION_URL)
+
+        throttle = UserFixedWindowThrottle()
+        window = int(throttle.timer() // throttle.duration)
+        key = throttle.cache_format % {"scope": "user", "ident": self.user.pk}
+
+        self.assertEqual(cache.get(f"{key}:{window}"), 5)
@@ -0,0 +1,108 @@
+from asgiref.sync import sync_to_async
+from rest_framework.settings import api_settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    UserRateThrottle,
+)
+
+
+class FixedWindowMixin:
+    """
+    Count requests per fixed window with one atomic increment in the cache
+    instead of storing and trimming a list of request timestamps. With a
+    shared cache (Redis) the limit holds across all workers.
+    """
+
+    def window_key(self, request, view):
+        """Cache key of the current window, None if the request is not limited"""
+        if self.rate is None:
+            return None
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return None
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        return f"{self.key}:{window}"
+
+    def allow_request(self, request, view):
+        key = self.window_key(request, view)
+        if key is None:
+            return True
+
+        self.cache.add(key, 0, self.duration)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # The counter expired between add() and incr()
+            self.cache.add(key, 1, self.duration)
+            count = 1
+
+        return count <= self.num_requests
+
+    async def aallow_request(self, request, view):
+        """Async counterpart of allow_request, sharing its counters"""
+        key = self.window_key(request, view)
+        if key is None:
+            return True
+
+        await self.cache.aadd(key, 0, self.duration)
+        try:
+            count = await self.cache.aincr(key)
+        except ValueError:
+            await self.cache.aadd(key, 1, self.duration)
+            count = 1
+
+        return count <= self.num_requests
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
+
+
+class AnonFixedWindowThrottle(FixedWindowMixin, AnonRateThrottle):
+    pass
+
+
+class UserFixedWindowThrottle(FixedWindowMixin, UserRateThrottle):
+    pass
+
+
+class ScopedFixedWindowThrottle(FixedWindowMixin, ScopedRateThrottle):
+    """
+    Limit views by `throttle_scope`, or per action by `throttle_scopes`
+    (ex. {"create": "order_create"}). Views without a scope are not limited.
+    """
+
+    def window_key(self, request, view):
+        self.scope = getattr(view, "throttle_scopes", {}).get(
+            getattr(view, "action", None),
+            getattr(view, self.scope_attr, None),
+        )
+        if not self.scope:
+            return None
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().window_key(request, view)
+
+
+async def acheck_throttles(request, view):
+    """
+    Run the DEFAULT_THROTTLE_CLASSES for a plain async view, which DRF does
+    not throttle, against its `throttle_scope`. Returns the seconds to wait
+    before retrying, or None if the request is allowed.
+    """
+    durations = []
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if hasattr(throttle, "aallow_request"):
+            allowed = await throttle.aallow_request(request, view)
+        else:
+            allowed = await sync_to_async(throttle.allow_request)(request, view)
+        if not allowed:
+            durations.append(throttle.wait() or 0)
+
+    return max(durations) if durations else None
@@ -1,14 +1,21 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from station import async_views
 from station.views import (
     TrainViewSet,
     TrainTypeViewSet,
     RouteViewSet,
     StationViewSet,
     JourneyViewSet,
+    JourneyScheduleViewSet,
     CrewViewSet,
+    CrewAssignmentViewSet,
     OrderViewSet,
+    SeatHoldViewSet,
+    ExportView,
+    LoadFactorView,
+    TrainUtilizationView,
 )
 
 router = routers.DefaultRouter()
@@ -17,10 +24,36 @@ router.register("stations", StationViewSet)
 router.register("trains", TrainViewSet)
 router.register("train-types", TrainTypeViewSet)
 router.register("journeys", JourneyViewSet)
+router.register("schedules", JourneyScheduleViewSet)
 router.register("crews", CrewViewSet)
+router.register("crew-assignments", CrewAssignmentViewSet)
 router.register("orders", OrderViewSet)
+router.register("holds", SeatHoldViewSet)
 
 urlpatterns = [
+    path("async/stations/", async_views.station_list, name="async-station-list"),
+    path("async/journeys/", async_views.journey_list, name="async-journey-list"),
+    path(
+        "async/journeys/<int:pk>/seats/",
+        async_views.journey_seats,
+        name="async-journey-seats",
+    ),
+    path(
+        "async/journeys/<int:pk>/seats/events/",
+        async_views.journey_seat_events,
+        name="async-journey-seat-events",
+    ),
+    path("exports/<str:dataset>/", ExportView.as_view(), name="export"),
+    path(
+        "analytics/load-factors/",
+        LoadFactorView.as_view(),
+        name="analytics-load-factors",
+    ),
+    path(
+        "analytics/train-utilization/",
+        TrainUtilizationView.as_view(),
+        name="analytics-train-utilization",
+    ),
     path("", include(router.urls)),
 ]
 
@@ -1,18 +1,48 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError, NotFound
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from station.analytics import GROUPINGS, cached_load_factors, cached_train_utilization
+from station.exports import DATASETS, export_querysets, stream_csv
+from station.filters import params_to_ints, filter_stations, filter_journeys
+from station.images import delete_variants
+from station.idempotency import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    claim_key,
+    complete_key,
+    release_key,
+    request_fingerprint,
+)
 from station.models import (
     Route,
     Station,
     Crew,
+    CrewAssignment,
     Order,
+    ArchivedOrder,
+    ArchivedTicket,
     Journey,
+    JourneySchedule,
     Train,
-    TrainType
+    TrainType,
+    ImageJob,
+    SeatHold,
+    Ticket,
 )
 from station.serializers import (
     RouteSerializer,
@@ -29,15 +59,191 @@ from station.serializers import (
     TrainListSerializer,
     TrainDetailSerializer,
     OrderListSerializer,
+    ArchivedOrderSerializer,
     StationListSerializer,
     StationImageSerializer,
     TrainImageSerializer,
+    SeatHoldSerializer,
+    OrderCancelTicketsSerializer,
+    ExportParamsSerializer,
+    LoadFactorParamsSerializer,
+    JourneyScheduleSerializer,
+    ScheduleWindowSerializer,
+    DynamicFieldsMixin,
+    CrewAssignmentSerializer,
+    TrainUtilizationParamsSerializer,
+)
+from station.bookings import SeatHoldExpired, lock_journeys, release_tickets, record_sold_seats
+from station.outbox import (
+    JOURNEY_DELETED,
+    ORDER_CANCELLED,
+    ORDER_CREATED,
+    TICKETS_CANCELLED,
+    journey_event,
+    order_event,
+    record_events,
 )
+from station.schedules import generate_journeys, expand_departures
+from station.seat_events import publish_seats_freed
+from station.tenancy import request_operator_id
+
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type={"type": "string"},
+        description="Comma-separated fields to return, all by default (ex. ?fields=id,name)",
+    ),
+    OpenApiParameter(
+        "expand",
+        type={"type": "string"},
+        description="Comma-separated related objects to embed where supported (ex. ?expand=route,train)",
+    ),
+]
+
+
+class SparseFieldsMixin:
+    """
+    `?fields=` trims list and retrieve responses to the named fields and
+    `?expand=` embeds related objects; `wants` lets get_queryset skip the
+    joins and annotations of fields that are not returned.
+    """
+    sparse_fields_actions = ("list", "retrieve")
+
+    def _query_param_list(self, name):
+        if getattr(self, "action", None) not in self.sparse_fields_actions:
+            return None
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    @property
+    def requested_fields(self):
+        return self._query_param_list("fields")
+
+    @property
+    def requested_expand(self):
+        return self._query_param_list("expand") or []
+
+    def wants(self, *names):
+        """Whether the response includes any of the fields"""
+        fields = self.requested_fields
+        if fields is None:
+            return True
+        return any(name in fields or name in self.requested_expand for name in names)
+
+    def only_requested(self, queryset):
+        """Load only the requested columns when every requested field is a model column"""
+        if self.requested_fields is None:
+            return queryset
+        names = set(self.requested_fields) | set(self.requested_expand)
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        if names <= columns:
+            return queryset.only(*names)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if (
+            getattr(self, "action", None) in self.sparse_fields_actions
+            and issubclass(self.get_serializer_class(), DynamicFieldsMixin)
+        ):
+            kwargs.setdefault("fields", self.requested_fields)
+            kwargs.setdefault("expand", self.requested_expand)
+        return super().get_serializer(*args, **kwargs)
+
+
+class OperatorScopedMixin:
+    """
+    Resolve the request's operator into `request.operator_id` and limit the
+    queryset to its rows through `operator_lookup`.
+    """
+    operator_lookup = "operator"
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        request.operator_id = request_operator_id(request)
+
+    def filter_queryset(self, queryset):
+        return super().filter_queryset(queryset).filter(
+            **{self.operator_lookup: self.request.operator_id}
+        )
+
+
+class IdempotentCreateMixin:
+    """
+    Run a create once per `Idempotency-Key` header and replay its response
+    to retries with the same key, see station.idempotency.
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                type={"type": "string"},
+                location=OpenApiParameter.HEADER,
+                description="Unique key of the request; retries with it return the first response",
+            ),
+        ]
+    )
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        record = claim_key(request.user, key, request_fingerprint(request))
+        if record is not None:
+            return Response(
+                record.response,
+                status=record.status_code,
+                headers={REPLAYED_HEADER: "true"},
+            )
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            release_key(request.user, key)
+            raise
+        complete_key(request.user, key, response)
+        return response
 
 
-class RouteViewSet(viewsets.ModelViewSet):
-    queryset = Route.objects.all().select_related("source", "destination")
+class BulkWriteMixin:
+    """Adds `/bulk/`: POST a list to create, PATCH a list of items with `id` to update"""
+
+    @action(
+        methods=["POST", "PATCH"],
+        detail=False,
+    )
+    def bulk(self, request):
+        """Create or partially update many objects in one request"""
+        list_kwargs = {
+            "data": request.data,
+            "many": True,
+            "allow_empty": False,
+            "max_length": settings.BULK_MAX_ITEMS,
+        }
+        if request.method == "PATCH":
+            serializer = self.get_serializer(
+                self.filter_queryset(self.get_queryset()), partial=True, **list_kwargs
+            )
+        else:
+            serializer = self.get_serializer(**list_kwargs)
+
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if request.method == "POST" else status.HTTP_200_OK,
+        )
+
+
+class RouteViewSet(OperatorScopedMixin, SparseFieldsMixin, BulkWriteMixin, viewsets.ModelViewSet):
+    queryset = Route.objects.all()
     serializer_class = RouteSerializer
+    throttle_scope = "catalog"
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -52,7 +258,13 @@ class RouteViewSet(viewsets.ModelViewSet):
         source = self.request.query_params.get("source")
         destination = self.request.query_params.get("destination")
 
-        queryset = self.queryset
+        queryset = self.only_requested(self.queryset)
+
+        if self.wants("source"):
+            queryset = queryset.select_related("source")
+
+        if self.wants("destination"):
+            queryset = queryset.select_related("destination")
 
         if source:
             if source.isdigit():
@@ -79,7 +291,8 @@ class RouteViewSet(viewsets.ModelViewSet):
                 "destination",
                 type={"type": "string", "items": {"type": "number"}},
                 description="Filter by destination ID or name (ex. ?destination=4 OR ?destination=dnipro)",
-            )
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -87,14 +300,10 @@ class RouteViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-def _params_to_ints(queryset):
-    """Convert a list of string IDs to a list of integers."""
-    return [int(str_id) for str_id in queryset.split(",") if str_id.isdigit()]
-
-
-class StationViewSet(viewsets.ModelViewSet):
+class StationViewSet(SparseFieldsMixin, BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
+    throttle_scope = "catalog"
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -105,22 +314,7 @@ class StationViewSet(viewsets.ModelViewSet):
             return StationSerializer
 
     def get_queryset(self):
-        name = self.request.query_params.get("name")
-
-        queryset = self.queryset
-
-        if name:
-            names = [city_name.strip() for city_name in name.split(",")]
-            name_ids = _params_to_ints(name)
-            city = [city_name.capitalize() for city_name in names if not city_name.isdigit()]
-
-            if name_ids:
-                queryset = queryset.filter(id__in=name_ids)
-
-            if city:
-                queryset = queryset.filter(name__in=city)
-
-        return queryset.distinct()
+        return filter_stations(self.only_requested(self.queryset), self.request.query_params)
 
     @action(
         methods=["POST"],
@@ -128,12 +322,20 @@ class StationViewSet(viewsets.ModelViewSet):
         url_path="upload-image",
     )
     def upload_image(self, request, pk=None):
+        """Store the image and queue generation of its resized variants"""
         station = self.get_object()
         serializer = self.get_serializer(station, data=request.data)
 
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The worker only replaces variants it finds, so drop the old image's now
+        old_variants = station.image_variants
+        with transaction.atomic():
+            serializer.save(image_variants={})
+            ImageJob.enqueue(station)
+            transaction.on_commit(
+                lambda: delete_variants(station.image.storage, old_variants)
+            )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
     @extend_schema(
         parameters=[
@@ -141,7 +343,8 @@ class StationViewSet(viewsets.ModelViewSet):
                 "name",
                 type={"type": "string", "items": {"type": "number"}},
                 description="Filter by city name or ID (ex. ?name=lviv OR ?name=2)",
-            )
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -149,18 +352,86 @@ class StationViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
 
+    def get_queryset(self):
+        return self.only_requested(self.queryset)
+
+
+class CrewAssignmentViewSet(
+    OperatorScopedMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    queryset = CrewAssignment.objects.all()
+    serializer_class = CrewAssignmentSerializer
+    operator_lookup = "journey__operator"
+
+    def get_queryset(self):
+        """Retrieve assignments with filters"""
+        crew = self.request.query_params.get("crew")
+        journey = self.request.query_params.get("journey")
+
+        queryset = self.queryset
+
+        if crew:
+            queryset = queryset.filter(crew_id__in=params_to_ints(crew))
+
+        if journey:
+            queryset = queryset.filter(journey_id__in=params_to_ints(journey))
+
+        return queryset
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    @action(
+        methods=["POST"],
+        detail=False,
+    )
+    def roster(self, request):
+        """Assign many crew members to journeys at once, rejecting overlaps"""
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.BULK_MAX_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class JourneyViewSet(viewsets.ModelViewSet):
-    queryset = Journey.objects.all().select_related(
-        "route__source",
-        "route__destination",
-        "train__train_type",
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "crew",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by crew member ID (ex. ?crew=1,2)",
+            ),
+            OpenApiParameter(
+                "journey",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by journey ID (ex. ?journey=3)",
+            ),
+        ]
     )
+    def list(self, request, *args, **kwargs):
+        """Get list of crew assignments"""
+        return super().list(request, *args, **kwargs)
+
+
+class JourneyViewSet(OperatorScopedMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = Journey.objects.all()
     serializer_class = JourneySerializer
+    throttle_scope = "catalog"
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -171,32 +442,30 @@ class JourneyViewSet(viewsets.ModelViewSet):
             return JourneySerializer
 
     def get_queryset(self):
-        """Retrieve journey with filters"""
-        source = self.request.query_params.get("source")
-        destination = self.request.query_params.get("destination")
-        train_name = self.request.query_params.get("train_name")
+        """Retrieve journey with filters, joining and counting only what is returned"""
+        queryset = self.only_requested(self.queryset)
 
-        queryset = self.queryset
+        if self.wants("source", "route"):
+            queryset = queryset.select_related("route__source")
 
-        if source:
-            if source.isdigit():
-                queryset = queryset.filter(route__source__id__in=source)
-            else:
-                queryset = queryset.filter(route__source__name__icontains=source)
+        if self.wants("destination", "route"):
+            queryset = queryset.select_related("route__destination")
 
-        if destination:
-            if destination.isdigit():
-                queryset = queryset.filter(route__destination__id__in=destination)
-            else:
-                queryset = queryset.filter(route__destination__name__icontains=destination)
+        if self.wants("train"):
+            queryset = queryset.select_related("train__train_type")
+        elif self.wants("train_name", "number_of_seats", "num_of_available_seats"):
+            queryset = queryset.select_related("train")
 
-        if train_name:
-            if train_name.isdigit():
-                queryset = queryset.filter(train__id__in=train_name)
-            else:
-                queryset = queryset.filter(train__name__icontains=train_name)
+        if self.wants("num_of_available_seats") or "min_available" in self.request.query_params:
+            queryset = queryset.with_seat_counts()
 
-        return queryset.distinct()
+        return filter_journeys(queryset, self.request.query_params)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            event = journey_event(instance, JOURNEY_DELETED)
+            instance.delete()
+            record_events([event])
 
     @extend_schema(
         parameters=[
@@ -214,7 +483,13 @@ class JourneyViewSet(viewsets.ModelViewSet):
                 "train_name",
                 type={"type": "string", "items": {"type": "number"}},
                 description="Filter by train_name name or ID (ex. ?train_name=Kyiv Express OR ?train_name=1)",
-            )
+            ),
+            OpenApiParameter(
+                "min_available",
+                type={"type": "number"},
+                description="Filter by minimum number of available seats (ex. ?min_available=2)",
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -222,9 +497,72 @@ class JourneyViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class TrainViewSet(viewsets.ModelViewSet):
+class JourneyScheduleViewSet(OperatorScopedMixin, viewsets.ModelViewSet):
+    queryset = JourneySchedule.objects.all()
+    serializer_class = JourneyScheduleSerializer
+    operator_lookup = "route__operator"
+
+    def get_serializer_class(self):
+        if self.action in ("generate", "departures"):
+            return ScheduleWindowSerializer
+        else:
+            return JourneyScheduleSerializer
+
+    @action(
+        methods=["POST"],
+        detail=True,
+    )
+    def generate(self, request, pk=None):
+        """Create the schedule's journeys for a date window, skipping existing ones"""
+        schedule = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            journeys = generate_journeys(schedule, **serializer.validated_data)
+        return Response({"created": len(journeys)}, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "date_from",
+                type=OpenApiTypes.DATE,
+                description="First day of the window (ex. ?date_from=2025-06-01)",
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=OpenApiTypes.DATE,
+                description="Last day of the window (ex. ?date_to=2025-06-30)",
+            ),
+            OpenApiParameter(
+                "route",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by route ID (ex. ?route=1,2)",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+    )
+    def departures(self, request):
+        """Scheduled departures for a date window, whether materialized or not"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        schedules = self.filter_queryset(self.get_queryset())
+        route = request.query_params.get("route")
+        if route:
+            schedules = schedules.filter(route_id__in=params_to_ints(route))
+
+        return Response(expand_departures(schedules, **serializer.validated_data))
+
+
+class TrainViewSet(OperatorScopedMixin, SparseFieldsMixin, BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Train.objects.all()
     serializer_class = TrainSerializer
+    throttle_scope = "catalog"
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -240,14 +578,17 @@ class TrainViewSet(viewsets.ModelViewSet):
         name = self.request.query_params.get("name")
         train_type = self.request.query_params.get("train_type")
 
-        queryset = self.queryset
+        queryset = self.only_requested(self.queryset)
+
+        if self.wants("train_type"):
+            queryset = queryset.select_related("train_type")
 
         if name:
-            name_ids = _params_to_ints(name)
+            name_ids = params_to_ints(name)
             queryset = queryset.filter(id__in=name_ids)
 
         if train_type:
-            train_type_ids = _params_to_ints(train_type)
+            train_type_ids = params_to_ints(train_type)
             queryset = queryset.filter(id__in=train_type_ids)
 
         return queryset.distinct()
@@ -258,12 +599,20 @@ class TrainViewSet(viewsets.ModelViewSet):
         url_path="upload-image",
     )
     def upload_image(self, request, pk=None):
+        """Store the image and queue generation of its resized variants"""
         train = self.get_object()
         serializer = self.get_serializer(train, data=request.data)
 
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The worker only replaces variants it finds, so drop the old image's now
+        old_variants = train.image_variants
+        with transaction.atomic():
+            serializer.save(image_variants={})
+            ImageJob.enqueue(train)
+            transaction.on_commit(
+                lambda: delete_variants(train.image.storage, old_variants)
+            )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
     @extend_schema(
         parameters=[
@@ -276,7 +625,8 @@ class TrainViewSet(viewsets.ModelViewSet):
                 "train_type",
                 type={"type": "string", "items": {"type": "number"}},
                 description="Filter by train_type name ID (ex. ?train_type=1)",
-            )
+            ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -284,14 +634,15 @@ class TrainViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class TrainTypeViewSet(viewsets.ModelViewSet):
+class TrainTypeViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = TrainType.objects.all()
     serializer_class = TrainTypeSerializer
+    throttle_scope = "catalog"
 
     def get_queryset(self):
         name_list = self.request.query_params.getlist("name")
 
-        queryset = self.queryset
+        queryset = self.only_requested(self.queryset)
 
         if name_list:
             try:
@@ -310,6 +661,7 @@ class TrainTypeViewSet(viewsets.ModelViewSet):
                 type={"type": "array", "items": {"type": "number"}},
                 description="Filter by name ID (ex. ?name=1,2)",
             ),
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -318,6 +670,9 @@ class TrainTypeViewSet(viewsets.ModelViewSet):
 
 
 class OrderViewSet(
+    OperatorScopedMixin,
+    SparseFieldsMixin,
+    IdempotentCreateMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
@@ -325,20 +680,297 @@ class OrderViewSet(
     queryset = Order.objects.select_related("user").select_related("tickets__journey__train")
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated, )
+    throttle_scope = "orders"
+    throttle_scopes = {"create": "order_create"}
 
     def get_serializer_class(self):
         if self.action == "list":
             return OrderListSerializer
+        elif self.action == "cancel_tickets":
+            return OrderCancelTicketsSerializer
+        elif self.action == "archived":
+            return ArchivedOrderSerializer
         else:
             return OrderSerializer
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).select_related(
-            "user"
-        ).prefetch_related(
-            "tickets__journey__route__source",
-            "tickets__journey__route__destination",
+        queryset = self.only_requested(Order.objects.filter(user=self.request.user))
+
+        if self.wants("tickets"):
+            queryset = queryset.prefetch_related(
+                "tickets__journey__route__source",
+                "tickets__journey__route__destination",
+                "tickets__journey__train",
+            )
+
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def _cancel(self, pk, ticket_ids=None):
+        """Release the order's tickets (or the given ones) in one transaction"""
+        with transaction.atomic():
+            order = get_object_or_404(
+                self.filter_queryset(Order.objects.select_for_update()),
+                pk=pk,
+                user=self.request.user,
+            )
+            if order.cancelled_at is not None:
+                raise ValidationError("The order is already cancelled.")
+
+            tickets = order.tickets.all()
+            if ticket_ids is not None:
+                tickets = tickets.filter(id__in=ticket_ids)
+                if tickets.count() != len(set(ticket_ids)):
+                    raise ValidationError({"tickets": "Tickets must belong to the order."})
+
+            if tickets.filter(journey__departure_time__lte=timezone.now()).exists():
+                raise ValidationError("Tickets of departed journeys cannot be cancelled.")
+
+            released = release_tickets(tickets)
+
+            if not order.tickets.exists():
+                order.cancelled_at = timezone.now()
+                order.save(update_fields=["cancelled_at"])
+            record_events([order_event(
+                order,
+                TICKETS_CANCELLED if order.cancelled_at is None else ORDER_CANCELLED,
+                released,
+            )])
+
+        return Response(
+            OrderSerializer(order, context=self.get_serializer_context()).data,
+            status=status.HTTP_200_OK,
         )
 
+    @action(
+        methods=["POST"],
+        detail=True,
+    )
+    def cancel(self, request, pk=None):
+        """Cancel the whole order and release all its seats"""
+        return self._cancel(pk)
+
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="cancel-tickets",
+    )
+    def cancel_tickets(self, request, pk=None):
+        """Cancel some tickets of the order and release their seats"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self._cancel(pk, serializer.validated_data["tickets"])
+
+    @action(
+        methods=["GET"],
+        detail=False,
+    )
+    def archived(self, request):
+        """
+        Tickets `archive_bookings` moved out of the order list, with their
+        archived orders and the hot orders that still have upcoming tickets
+        """
+        orders = [
+            *ArchivedOrder.objects.filter(user=request.user, operator_id=request.operator_id),
+            *Order.objects.filter(
+                user=request.user,
+                operator_id=request.operator_id,
+                id__in=ArchivedTicket.objects.values("order_id"),
+            ),
+        ]
+        orders.sort(key=lambda order: order.created_at, reverse=True)
+
+        tickets = defaultdict(list)
+        for ticket in ArchivedTicket.objects.filter(
+            order_id__in=[order.id for order in orders]
+        ).prefetch_related(
+            Prefetch(
+                "journey",
+                queryset=Journey.objects.with_seat_counts().select_related(
+                    "route__source", "route__destination", "train"
+                ),
+            )
+        ):
+            tickets[ticket.order_id].append(ticket)
+        for order in orders:
+            order.archived_ticket_list = tickets[order.id]
+
+        return Response(self.get_serializer(orders, many=True).data)
+
+
+class SeatHoldViewSet(
+    OperatorScopedMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    """Reserve seats for SEAT_HOLD_TTL seconds before ordering them"""
+    queryset = SeatHold.objects.all()
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated, )
+    operator_lookup = "journey__operator"
+
+    def get_queryset(self):
+        return SeatHold.objects.filter(
+            user=self.request.user,
+            expires_at__gt=timezone.now(),
+        ).prefetch_related("seats")
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            publish_seats_freed(instance.seats.all())
+            instance.delete()
+
+    @action(
+        methods=["POST"],
+        detail=True,
+    )
+    def confirm(self, request, pk=None):
+        """Turn the hold into an order with a ticket for every held seat"""
+        holds = self.filter_queryset(SeatHold.objects.filter(user=request.user))
+        with transaction.atomic():
+            journey_id = get_object_or_404(holds, pk=pk).journey_id
+            # Expired holds are dropped by reserve_seats under this lock, so
+            # the hold and its seats are re-read after taking it
+            lock_journeys([journey_id])
+            hold = holds.select_for_update().select_related("journey").filter(pk=pk).first()
+            if hold is None or hold.is_expired:
+                raise SeatHoldExpired()
+            if hold.journey.departure_time <= timezone.now():
+                raise ValidationError("Seats of departed journeys cannot be booked.")
+
+            order = Order.objects.create(user=request.user, operator_id=request.operator_id)
+            tickets = Ticket.objects.bulk_create([
+                Ticket(order=order, journey_id=seat.journey_id, cargo=seat.cargo, seat=seat.seat)
+                for seat in hold.seats.all()
+            ])
+            record_sold_seats(tickets)
+            record_events([order_event(order, ORDER_CREATED, tickets)])
+            hold.delete()
+
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+
+class ExportView(OperatorScopedMixin, APIView):
+    """Stream tickets or journeys as CSV for bulk analytics"""
+    permission_classes = (IsAdminUser, )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "columns",
+                type={"type": "string"},
+                description="Comma-separated columns to export, all by default (ex. ?columns=id,journey,seat)",
+            ),
+            OpenApiParameter(
+                "departure_from",
+                type=OpenApiTypes.DATETIME,
+                description="Only rows departing at or after this time (ex. ?departure_from=2025-01-01T00:00)",
+            ),
+            OpenApiParameter(
+                "departure_to",
+                type=OpenApiTypes.DATETIME,
+                description="Only rows departing before this time (ex. ?departure_to=2025-02-01T00:00)",
+            ),
+        ],
+        responses={(200, "text/csv"): OpenApiTypes.STR},
+    )
+    def get(self, request, dataset):
+        if dataset not in DATASETS:
+            raise NotFound(f"Unknown dataset. Available: {', '.join(DATASETS)}")
+
+        serializer = ExportParamsSerializer(
+            data=request.query_params, context={"dataset": dataset}
+        )
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        columns = params.pop("columns", list(DATASETS[dataset]["columns"]))
+
+        response = StreamingHttpResponse(
+            stream_csv(
+                export_querysets(dataset, columns, operator_id=request.operator_id, **params),
+                columns,
+            ),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.csv"'
+        return response
+
+
+class LoadFactorView(OperatorScopedMixin, APIView):
+    """Sold seats against capacity per journey, route, train type or day"""
+    permission_classes = (IsAdminUser, )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "group_by",
+                type={"type": "string"},
+                enum=list(GROUPINGS),
+                description="Aggregate per journey, route, train_type or day, route by default (ex. ?group_by=day)",
+            ),
+            OpenApiParameter(
+                "departure_from",
+                type=OpenApiTypes.DATETIME,
+                description="Only journeys departing at or after this time (ex. ?departure_from=2025-01-01T00:00)",
+            ),
+            OpenApiParameter(
+                "departure_to",
+                type=OpenApiTypes.DATETIME,
+                description="Only journeys departing before this time (ex. ?departure_to=2025-02-01T00:00)",
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "number"},
+                description="Maximum number of groups, 100 by default (ex. ?limit=10)",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        serializer = LoadFactorParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            cached_load_factors(operator_id=request.operator_id, **serializer.validated_data)
+        )
+
+
+class TrainUtilizationView(OperatorScopedMixin, APIView):
+    """Share of a period each train spends running journeys"""
+    permission_classes = (IsAdminUser, )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "period_start",
+                type=OpenApiTypes.DATETIME,
+                required=True,
+                description="Start of the period (ex. ?period_start=2025-06-01T00:00)",
+            ),
+            OpenApiParameter(
+                "period_end",
+                type=OpenApiTypes.DATETIME,
+                required=True,
+                description="End of the period (ex. ?period_end=2025-07-01T00:00)",
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "number"},
+                description="Maximum number of trains, 100 by default (ex. ?limit=10)",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        serializer = TrainUtilizationParamsSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            cached_train_utilization(operator_id=request.operator_id, **serializer.validated_data)
+        )
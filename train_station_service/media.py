@@ -0,0 +1,43 @@
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+
+# Uploaded file names carry their content hash, so they never change
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def serve_media(request, path):
+    """
+    Serve an uploaded file according to MEDIA_SERVING: hand it to the web
+    server with X-Accel-Redirect (nginx) or X-Sendfile (Apache, lighttpd),
+    or stream it with FileResponse, which the WSGI server can send with
+    sendfile().
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found")
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+
+    if settings.MEDIA_SERVING == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(settings.MEDIA_ACCEL_PREFIX + path)
+    elif settings.MEDIA_SERVING == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = full_path
+    else:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["Cache-Control"] = CACHE_CONTROL
+    return response
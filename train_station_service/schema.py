@@ -0,0 +1,99 @@
+import functools
+import hashlib
+import json
+from importlib.metadata import version
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import translation
+from django.utils.http import parse_etags
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+# Project packages whose code shapes the schema
+SCHEMA_SOURCES = ("station", "user", "train_station_service")
+SCHEMA_DISTRIBUTIONS = ("Django", "djangorestframework", "drf-spectacular")
+
+
+@functools.cache
+def code_fingerprint():
+    """
+    Hash of the project sources and API package versions, computed once per
+    process since code only changes with a restart.
+    """
+    digest = hashlib.sha256()
+    for package in SCHEMA_SOURCES:
+        for path in sorted((settings.BASE_DIR / package).rglob("*.py")):
+            if "tests" in path.parts:
+                continue
+            digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+            digest.update(path.read_bytes())
+    for distribution in SCHEMA_DISTRIBUTIONS:
+        digest.update(f"{distribution}=={version(distribution)}".encode())
+    return digest.hexdigest()[:20]
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_schema_file(path=None):
+    """Generate the schema and store it with the fingerprint of the code"""
+    path = path or settings.SCHEMA_FILE
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"fingerprint": code_fingerprint(), "schema": generate_schema()}, file)
+    return path
+
+
+def load_schema():
+    """The schema from SCHEMA_FILE if it was built from this code, else a fresh one"""
+    try:
+        with open(settings.SCHEMA_FILE, encoding="utf-8") as file:
+            stored = json.load(file)
+    except (OSError, ValueError):
+        stored = {}
+
+    if stored.get("fingerprint") == code_fingerprint():
+        return stored["schema"]
+    return generate_schema()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Serve the default schema rendered once per code version, format and
+    language, with an ETag so unchanged schemas are answered with 304.
+    """
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        if version:
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        variant = f"{code_fingerprint()}-{renderer.format}-{translation.get_language()}"
+        etag = f'"{variant}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponseNotModified(headers={"ETag": etag})
+
+        content = cache.get_or_set(
+            f"openapi-schema:{variant}:{request.accepted_media_type}",
+            lambda: renderer.render(
+                load_schema(), request.accepted_media_type, self.get_renderer_context()
+            ),
+            timeout=None,
+        )
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        return HttpResponse(
+            content,
+            content_type=content_type,
+            headers={
+                "ETag": etag,
+                "Cache-Control": "no-cache",
+                "Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"',
+            },
+        )
@@ -16,6 +16,11 @@ from pathlib import Path
 
 load_dotenv()
 
+
+def env_flag(name, default):
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -27,25 +32,29 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_flag("DJANGO_DEBUG", True)
 
 ALLOWED_HOSTS = []
 
 
 # Application definition
 
+# Apps serving only developers and admins. Each adds to the import time of
+# every worker start, so API-only workers can switch them off
+# (ex. ADMIN_ENABLED=false API_DOCS_ENABLED=false DJANGO_DEBUG=false).
+ADMIN_ENABLED = env_flag("ADMIN_ENABLED", True)
+API_DOCS_ENABLED = env_flag("API_DOCS_ENABLED", True)
+DEBUG_TOOLBAR_ENABLED = env_flag("DEBUG_TOOLBAR_ENABLED", DEBUG)
+
 INSTALLED_APPS = [
-    "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
-    "debug_toolbar",
     "station",
     "user",
-    "drf_spectacular"
 ]
 
 MIDDLEWARE = [
@@ -56,9 +65,22 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "station.middleware.ReplicaRoutingMiddleware",
 ]
 
+if ADMIN_ENABLED:
+    INSTALLED_APPS.insert(0, "django.contrib.admin")
+
+if API_DOCS_ENABLED:
+    INSTALLED_APPS.append("drf_spectacular")
+
+if DEBUG_TOOLBAR_ENABLED:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("station.middleware.ReplicaRoutingMiddleware"),
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
 ROOT_URLCONF = "train_station_service.urls"
 
 TEMPLATES = [
@@ -82,16 +104,65 @@ WSGI_APPLICATION = "train_station_service.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": os.environ["POSTGRES_DB"],
-        "USER": os.environ["POSTGRES_USER"],
-        "PASSWORD": os.environ["POSTGRES_PASSWORD"],
-        "HOST": os.environ["POSTGRES_HOST"],
-        "PORT": os.environ["POSTGRES_PORT"],
+if os.getenv("POSTGRES_DB"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["POSTGRES_DB"],
+            "USER": os.environ["POSTGRES_USER"],
+            "PASSWORD": os.environ["POSTGRES_PASSWORD"],
+            "HOST": os.environ["POSTGRES_HOST"],
+            "PORT": os.environ["POSTGRES_PORT"],
+        }
+    }
+else:
+    # Without Postgres settings (image builds, tooling) fall back to SQLite
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        }
+    }
+
+# Optional read replica for catalog and timetable reads (see station/db_routers.py).
+# Set POSTGRES_REPLICA_HOST to a second Postgres instance to enable it. Without
+# Postgres, SQLITE_REPLICA_NAME names a second SQLite file acting as a stale
+# replica (refresh it by copying db.sqlite3) to try the routing locally.
+
+REPLICA_DATABASE_ALIAS = None
+
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    REPLICA_DATABASE_ALIAS = "replica"
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES["default"],
+        "HOST": os.environ["POSTGRES_REPLICA_HOST"],
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+elif os.getenv("SQLITE_REPLICA_NAME") and DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+    REPLICA_DATABASE_ALIAS = "replica"
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": BASE_DIR / os.environ["SQLITE_REPLICA_NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["station.db_routers.ReplicaRouter"]
+
+# Seconds a user keeps reading from the primary after a write
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+# Shared cache for throttle counters, revocation checks and reports.
+# Set REDIS_URL so all workers see the same counters; without it each
+# process keeps its own in memory.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
     }
-}
 
 
 # Password validation
@@ -113,6 +184,32 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Hasher for new passwords: "pbkdf2" (Django's default) or "argon2", which
+# needs argon2-cffi. The other one stays listed so existing hashes verify
+# and are rehashed on the next login.
+
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "argon2": "user.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHER_PROFILE = os.getenv("PASSWORD_HASHER_PROFILE", "pbkdf2")
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE],
+    *(
+        hasher for profile, hasher in PASSWORD_HASHER_PROFILES.items()
+        if profile != PASSWORD_HASHER_PROFILE
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Argon2id costs, OWASP's minimum of 19 MiB and 2 passes on a single lane,
+# so each login occupies one core instead of Django's default of eight
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 19456))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -141,6 +238,14 @@ MEDIA_ROOT = "/files/media/"
 
 MEDIA_URL = "/media/"
 
+# How /media/ files reach clients: "file" streams them from the worker
+# (zero-copy where the WSGI server supports sendfile), "x-accel-redirect"
+# (nginx) and "x-sendfile" (Apache, lighttpd) let the web server send them
+MEDIA_SERVING = os.getenv("MEDIA_SERVING", "file")
+
+# nginx `internal` location that maps to MEDIA_ROOT, for x-accel-redirect
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -150,25 +255,31 @@ REST_FRAMEWORK = {
     # "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     # "PAGE_SIZE": 5,
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "station.permissions.IsAdminOrIfAuthenticatedReadOnly",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-       "rest_framework.throttling.AnonRateThrottle",
-       "rest_framework.throttling.UserRateThrottle"
+       "station.throttling.AnonFixedWindowThrottle",
+       "station.throttling.UserFixedWindowThrottle",
+       "station.throttling.ScopedFixedWindowThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
        "anon": "100/day",
-       "user": "1000/day"
+       "user": "1000/day",
+       "catalog": "300/minute",
+       "orders": "60/minute",
+       "order_create": "30/minute",
     }
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=500),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.ClaimsTokenRefreshSerializer",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -183,3 +294,78 @@ SPECTACULAR_SETTINGS = {
         "defaultModelExpandDepth": 2,
     },
 }
+
+# Real-time seat availability push (see station/seat_events.py)
+
+SEAT_EVENTS_BROKER = "station.seat_events.InProcessBroker"
+
+# Events buffered per subscriber before a slow client is asked to resync
+SEAT_EVENTS_QUEUE_SIZE = 100
+
+# Seconds between keep-alive comments on idle event streams
+SEAT_EVENTS_KEEPALIVE = 15
+
+# Background image processing (see station/management/commands/process_image_jobs.py)
+
+# Bounding boxes of the resized variants generated for every uploaded image
+IMAGE_VARIANT_SIZES = {
+    "thumbnail": (320, 320),
+    "medium": (1024, 1024),
+}
+
+# Seconds after which a running job is considered abandoned and retried
+IMAGE_JOB_TIMEOUT = 300
+
+IMAGE_JOB_MAX_ATTEMPTS = 3
+
+# Seconds seats stay reserved by a hold before they are released
+SEAT_HOLD_TTL = int(os.getenv("SEAT_HOLD_TTL", 600))
+
+# Rows fetched per round trip by the CSV export when COPY is not available
+EXPORT_CHUNK_SIZE = 2000
+
+# Seconds analytics reports are served from cache before being recomputed
+ANALYTICS_CACHE_SECONDS = 300
+
+# Longest date window journeys can be generated or listed for from schedules
+SCHEDULE_MAX_WINDOW_DAYS = 366
+
+# Largest list accepted by the `/bulk/` create and update endpoints
+BULK_MAX_ITEMS = 1000
+
+# Seconds a user's token version is cached before revocation is rechecked
+JWT_REVOCATION_CACHE_SECONDS = 30
+
+# Schema written by `python manage.py build_schema` and served by /api/doc/
+# while it matches the running code
+SCHEMA_FILE = BASE_DIR / "schema.json"
+
+# Target for a worker cold start (interpreter, settings, apps, middleware
+# and URLs), checked by `python manage.py startup_profile --check`
+STARTUP_TIME_BUDGET_MS = 1500
+
+# Operator owning rows created without one and serving requests without an
+# X-Operator header; created with this primary key by the migrations
+DEFAULT_OPERATOR_ID = 1
+
+# Seconds an operator slug stays resolved to its id
+OPERATOR_CACHE_SECONDS = 300
+
+# Seconds the response of a request with an Idempotency-Key is replayed to
+# retries, and seconds a key stays claimed by a request that never completes
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_SECONDS = 60
+
+# Where `python manage.py dispatch_outbox` sends order and journey events
+# (see station/outbox.py): each entry is a sink class and its options
+OUTBOX_SINKS = [
+    {
+        "BACKEND": "station.outbox.FileSink",
+        "OPTIONS": {"path": os.getenv("OUTBOX_FILE", BASE_DIR / "outbox.jsonl")},
+    },
+]
+if os.getenv("OUTBOX_WEBHOOK_URL"):
+    OUTBOX_SINKS.append({
+        "BACKEND": "station.outbox.WebhookSink",
+        "OPTIONS": {"url": os.environ["OUTBOX_WEBHOOK_URL"]},
+    })
@@ -14,23 +14,33 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.conf.urls.static import static
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
 
-from train_station_service import settings
+from train_station_service.media import serve_media
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/station/", include("station.urls", namespace="station")),
     path("api/user/", include("user.urls", namespace="user")),
-    path("__debug__/", include("debug_toolbar.urls")),
-    path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
-    path("api/doc/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
-    path("api/doc/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", serve_media, name="media"),
+]
+
+# Imported only when enabled to keep them out of API-only worker start-up
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
+
+if settings.DEBUG_TOOLBAR_ENABLED:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
+
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
+
+    from train_station_service.schema import CachedSpectacularAPIView
+
+    urlpatterns += [
+        path("api/doc/", CachedSpectacularAPIView.as_view(), name="schema"),
+        path("api/doc/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
+        path("api/doc/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    ]
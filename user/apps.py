@@ -1,6 +1,11 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 
 
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self):
+        # Register the OpenAPI extensions for the custom JWT classes
+        if apps.is_installed("drf_spectacular"):
+            import user.schema  # noqa: F401
@@ -0,0 +1,44 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, make_password
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 with costs from ARGON2_TIME_COST, ARGON2_MEMORY_COST and
+    ARGON2_PARALLELISM. Hashes made with other costs are upgraded on the
+    next successful login.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash the passwords with the configured hasher, spread over a pool of
+    `workers` processes (all cores by default). Daemonic processes, such as
+    parallel test runners, cannot start a pool and hash serially. None gives
+    an unusable password, as with `set_password(None)`.
+    """
+    passwords = list(passwords)
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(passwords) < 2 or multiprocessing.current_process().daemon:
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(len(passwords) // (workers * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,53 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import StatelessJWTAuthentication
+from user.serializers import ClaimsTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare per-request overhead of database and claims-based JWT authentication"
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", help="Email of the user to authenticate as")
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(email=options["email"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['email']} does not exist")
+
+        runs = (
+            ("database", JWTAuthentication(), AccessToken.for_user(user)),
+            (
+                "claims",
+                StatelessJWTAuthentication(),
+                ClaimsTokenObtainPairSerializer.get_token(user).access_token,
+            ),
+        )
+        for name, authentication, token in runs:
+            elapsed, queries = self._run(authentication, str(token), options["requests"])
+            self.stdout.write(
+                f"{name:<10} {elapsed * 1_000_000 / options['requests']:8.1f} us/req "
+                f"{queries / options['requests']:.3f} queries/req"
+            )
+
+    @staticmethod
+    def _run(authentication, token, total):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(total):
+                authentication.authenticate(request)
+            elapsed = time.perf_counter() - start
+
+        return elapsed, len(queries)
@@ -0,0 +1,31 @@
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Measure password checks per second on one core for each configured hasher"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20)
+
+    def handle(self, *args, **options):
+        password = "benchmark-password"
+
+        for hasher in get_hashers():
+            try:
+                encoded = hasher.encode(password, hasher.salt())
+            except ValueError as error:
+                self.stdout.write(f"{hasher.algorithm:<15} unavailable ({error})")
+                continue
+
+            start = time.perf_counter()
+            for _ in range(options["logins"]):
+                hasher.verify(password, encoded)
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{hasher.algorithm:<15} {elapsed * 1000 / options['logins']:8.1f} ms/login "
+                f"{options['logins'] / elapsed:8.1f} logins/s per core"
+            )
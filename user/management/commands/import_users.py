@@ -0,0 +1,100 @@
+import csv
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+
+from user.hashers import hash_passwords
+
+COLUMNS = ("email", "password", "first_name", "last_name", "is_staff")
+TRUE_VALUES = {"1", "true", "yes"}
+
+
+def read_users(rows):
+    """
+    Users to create from CSV rows, with normalized emails and without
+    duplicates. Returns the users and the errors of rejected rows.
+    """
+    User = get_user_model()
+    users, errors, seen = [], [], set()
+
+    for line, row in enumerate(rows, start=2):
+        email = User.objects.normalize_email((row.get("email") or "").strip())
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append(f"line {line}: invalid email {email!r}")
+            continue
+        if email in seen:
+            errors.append(f"line {line}: duplicate email {email}")
+            continue
+        seen.add(email)
+
+        users.append(User(
+            email=email,
+            # Hashed in bulk before the insert
+            password=row.get("password") or None,
+            first_name=row.get("first_name") or "",
+            last_name=row.get("last_name") or "",
+            is_staff=(row.get("is_staff") or "").strip().lower() in TRUE_VALUES,
+        ))
+    return users, errors
+
+
+def import_users(users, workers=None, batch_size=1000):
+    """
+    Create the users that don't exist yet with one bulk insert per batch,
+    hashing their passwords in parallel first. Returns the created users.
+    """
+    User = get_user_model()
+    existing = set()
+    emails = [user.email for user in users]
+    for start in range(0, len(emails), batch_size):
+        existing.update(
+            User.objects.filter(
+                email__in=emails[start:start + batch_size]
+            ).values_list("email", flat=True)
+        )
+    users = [user for user in users if user.email not in existing]
+
+    for user, password in zip(users, hash_passwords((user.password for user in users), workers)):
+        user.password = password
+
+    return User.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+
+
+class Command(BaseCommand):
+    help = "Create users from a CSV file with hashing spread over all cores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help=f"CSV file with a header row; columns: {', '.join(COLUMNS)} (only email is required)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processes hashing passwords (default: one per core)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as file:
+                reader = csv.DictReader(file)
+                if "email" not in (reader.fieldnames or ()):
+                    raise CommandError("The CSV file must have an email column")
+                users, errors = read_users(reader)
+        except OSError as error:
+            raise CommandError(error)
+
+        for error in errors:
+            self.stderr.write(error)
+
+        created = import_users(users, options["workers"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(created)} users, skipped {len(users) - len(created)} existing "
+            f"and {len(errors)} invalid rows"
+        ))
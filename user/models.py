@@ -2,10 +2,15 @@ from django.contrib.auth.models import (
     AbstractUser,
     BaseUserManager,
 )
+from django.core.cache import cache
 from django.db import models
 from django.utils.translation import gettext as _
 
 
+def token_version_cache_key(user_id):
+    return f"token-version:{user_id}"
+
+
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
 
@@ -40,11 +45,52 @@ class UserManager(BaseUserManager):
         return self._create_user(email, password, **extra_fields)
 
 
+# Changing any of these invalidates the user's tokens, which carry them as claims
+TOKEN_CLAIM_FIELDS = ("is_staff", "is_active", "operator_id")
+
+
 class User(AbstractUser):
     username = None
     email = models.EmailField(_("email address"), unique=True)
+    # Embedded in issued tokens; bumping it revokes all of them
+    token_version = models.PositiveIntegerField(default=0)
+    # Staff of one operator only ever work with its data; None for
+    # passengers and platform staff, who pick it with X-Operator
+    operator = models.ForeignKey(
+        "station.Operator",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="users",
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def save(self, *args, **kwargs):
+        """
+        Revoke the user's tokens when the password or the claims they carry
+        change. Hash upgrades on login keep `_password` unset and the tokens.
+        """
+        if not self._state.adding and self._token_claims_changed(kwargs.get("update_fields")):
+            self.token_version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "token_version"}
+
+        super().save(*args, **kwargs)
+        cache.delete(token_version_cache_key(self.pk))
+
+    def _token_claims_changed(self, update_fields):
+        if self._password is not None:
+            return True
+
+        checked = [
+            name for name in TOKEN_CLAIM_FIELDS
+            if update_fields is None or self._meta.get_field(name).name in update_fields
+        ]
+        if not checked:
+            return False
+        stored = type(self).objects.filter(pk=self.pk).values(*checked).first()
+        return bool(stored) and any(stored[name] != getattr(self, name) for name in checked)
@@ -1,6 +1,14 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
 from django.utils.translation import gettext as _
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from user.authentication import check_token_version, current_token_version
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,3 +39,25 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        """Sign the claims StatelessJWTAuthentication trusts into the token"""
+        token = super().get_token(user)
+        token["is_staff"] = user.is_staff
+        token["token_version"] = user.token_version
+        token["operator"] = user.operator_id
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        """Refuse to refresh tokens revoked since they were issued"""
+        refresh = self.token_class(attrs["refresh"])
+        if "token_version" in refresh:
+            check_token_version(
+                refresh, current_token_version(refresh[api_settings.USER_ID_CLAIM])
+            )
+        return super().validate(attrs)
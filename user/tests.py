@@ -1,3 +1,166 @@
+import multiprocessing
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, is_password_usable
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.hashers import hash_passwords
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+REFRESH_URL = reverse("user:token_refresh")
+ME_URL = reverse("user:manage")
+STATION_URL = reverse("station:station-list")
+
+
+class StatelessAuthenticationTests(TestCase):
+    """Test authentication from token claims."""
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+
+    def obtain_tokens(self, password="testpass"):
+        res = self.client.post(
+            TOKEN_URL, {"email": self.user.email, "password": password}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_token_carries_claims(self):
+        token = AccessToken(self.obtain_tokens()["access"])
+
+        self.assertEqual(token["is_staff"], False)
+        self.assertEqual(token["token_version"], 0)
+
+    def test_user_not_loaded_once_version_cached(self):
+        access = self.obtain_tokens()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.client.get(STATION_URL)
+
+        # Only the station list itself is queried
+        with self.assertNumQueries(1):
+            res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_password_change_revokes_tokens(self):
+        tokens = self.obtain_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.client.get(STATION_URL)
+
+        res = self.client.patch(ME_URL, {"password": "newpass"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(STATION_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        res = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_change_revokes_tokens(self):
+        self.user.is_staff = True
+        self.user.save()
+        access = self.obtain_tokens()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        self.user.is_staff = False
+        self.user.save()
+
+        res = self.client.get(STATION_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_change_keeps_tokens(self):
+        access = self.obtain_tokens()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        self.user.first_name = "Test"
+        self.user.save()
+
+        res = self.client.get(STATION_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_token_without_claims_loads_user(self):
+        access = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_me_returns_stored_user(self):
+        access = self.obtain_tokens()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data["email"], self.user.email)
+
+
+class ImportUsersTests(TestCase):
+    """Test bulk user import."""
+    def setUp(self):
+        get_user_model().objects.create_user("existing@test.com", "testpass")
+
+    def import_csv(self, content, **options):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command("import_users", file.name, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_users(self):
+        out, err = self.import_csv(
+            "email,password,first_name,is_staff\n"
+            "first@TEST.com,firstpass,First,yes\n"
+            "second@test.com,,,\n"
+            "existing@test.com,otherpass,,\n"
+            "first@test.com,again,,\n"
+            "not-an-email,pass,,\n",
+            workers=1,
+        )
+
+        self.assertIn("Created 2 users", out)
+        self.assertIn("line 5: duplicate email first@test.com", err)
+        self.assertIn("line 6: invalid email", err)
+
+        first = get_user_model().objects.get(email="first@test.com")
+        self.assertTrue(first.check_password("firstpass"))
+        self.assertTrue(first.is_staff)
+        self.assertEqual(first.first_name, "First")
+        self.assertFalse(
+            get_user_model().objects.get(email="second@test.com").has_usable_password()
+        )
+        self.assertTrue(
+            get_user_model().objects.get(email="existing@test.com").check_password("testpass")
+        )
+
+    def test_hash_passwords_in_pool(self):
+        if multiprocessing.current_process().daemon:
+            self.skipTest("daemonic processes, as under --parallel, cannot start a pool")
+
+        hashes = hash_passwords(["firstpass", None, "secondpass"], workers=2)
+
+        self.assertTrue(check_password("firstpass", hashes[0]))
+        self.assertFalse(is_password_usable(hashes[1]))
+        self.assertTrue(check_password("secondpass", hashes[2]))
 
-# Create your tests here.
+    def test_email_column_required(self):
+        with self.assertRaises(CommandError):
+            self.import_csv("name,password\nfirst,firstpass\n")
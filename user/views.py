@@ -1,3 +1,4 @@
+from django.contrib.auth import get_user_model
 from rest_framework import generics
 
 from rest_framework.permissions import IsAuthenticated
@@ -15,4 +16,5 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        # request.user is built from token claims and lacks the other fields
+        return get_user_model().objects.get(pk=self.request.user.pk)